@@ -0,0 +1,474 @@
+"""
+대시보드 화면 공통 분석 데이터
+
+페이지마다 반복하던 최신 월 추출, 반기 진행 정보, 예측 점수, 순위, 위험도 계산을
+데이터 버전당 한 번만 수행해 AnalysisContext로 공유
+지표 간 상관관계도 기간 단위별로 한 번에 계산해 CorrelationSet으로 공유
+이상치는 OutlierReport(긴 형식 표) 하나로 요약/상세 화면이 함께 사용
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from score_calculator import calculate_predicted_scores, get_ranking_changes, TARGET_SCORE
+
+# 위험도 구간 (예측 점수 - 목표 점수 하한, 등급)
+# 반기 최종(6개월차)과 진행 중 기준이 다름
+RISK_LEVELS_FINAL = [(0, '안전'), (-30, '주의'), (-60, '경고'), (-np.inf, '심각')]
+RISK_LEVELS_INTERIM = [(50, '안전'), (0, '양호'), (-30, '주의'), (-60, '경고'), (-np.inf, '위험')]
+
+# 위험도별 표시 색상, 아이콘
+RISK_STYLES = {
+    '안전': ('#28a745', '🟢'),
+    '양호': ('#20c997', '🟢'),
+    '주의': ('#ffc107', '🟡'),
+    '경고': ('#fd7e14', '🟠'),
+    '심각': ('#dc3545', '🔴'),
+    '위험': ('#dc3545', '🔴'),
+}
+
+PREDICTION_COLUMNS = [
+    '안전점검_예측', '중점고객_예측', '사용계약_예측',
+    '상담응대_예측', '상담기여_예측', '만족도_예측'
+]
+
+# 월별 순위표 컬럼 (순위: 총점 내림차순, 동점은 같은 순위)
+RANKING_COLUMNS = ['순위', '전월순위', '순위변동', '순위변동_표시', '백분위', '센터수']
+
+# 상관관계 분석 지표
+CORRELATION_COLUMNS = [
+    '안전점검_점수', '중점고객_점수', '사용계약_점수',
+    '상담응대_점수', '상담기여_점수', '만족도_점수'
+]
+CORRELATION_METHODS = {'pearson': 'Pearson', 'spearman': 'Spearman (순위)'}
+# 이동 상관계수 창 크기 (연속된 평가월 수)
+ROLLING_CORRELATION_MONTHS = 3
+CORRELATION_SCOPES = ['전체', '반기별', '월별', f'최근 {ROLLING_CORRELATION_MONTHS}개월 이동']
+# 강한 상관관계 기준 (|r| 초과)
+STRONG_CORRELATION = 0.7
+
+# 이상치 탐지 지표, 방법, 비교 단위
+OUTLIER_COLUMNS = ['총점', '안전점검_점수', '중점고객_점수', '사용계약_점수']
+OUTLIER_METHODS = {'iqr': 'IQR (사분위 범위)', 'mad': '로버스트 z (MAD)'}
+OUTLIER_GROUPINGS = ['전체', '반기별', '월별']
+IQR_MULTIPLIER = 1.5
+# 수정 z = 0.6745 × (값 - 중앙값) / MAD, |수정 z| > 3.5면 이상치 (Iglewicz-Hoaglin)
+ROBUST_Z_THRESHOLD = 3.5
+OUTLIER_TABLE_COLUMNS = ['그룹', '센터명', '평가월', '지표', '값', '하한', '상한', '방향']
+
+# 월별 추이 분포 (평가월별 센터 값의 분위수)
+TREND_BAND_QUANTILES = {'최소': 0.0, 'Q1': 0.25, '중앙값': 0.5, 'Q3': 0.75, '최대': 1.0}
+
+
+def get_period_info(month: int):
+    """평가월(1~12) → (상반기 여부, 반기 내 진행 월 1~6)"""
+    is_first_half = month <= 6
+    period_month = month if is_first_half else month - 6
+    return is_first_half, period_month
+
+
+def classify_risk_levels(predicted_scores: pd.Series, period_month: int) -> pd.Series:
+    """예측 점수 기반 위험도 일괄 판정"""
+    levels = RISK_LEVELS_FINAL if period_month >= 6 else RISK_LEVELS_INTERIM
+    gap = predicted_scores.to_numpy(dtype=np.float64) - TARGET_SCORE
+
+    conditions = [gap >= lower for lower, _ in levels]
+    labels = [label for _, label in levels]
+
+    return pd.Series(np.select(conditions, labels, default=labels[-1]), index=predicted_scores.index)
+
+
+@dataclass
+class RankingIndex:
+    """
+    월별 순위표
+
+    table: (평가월, 센터명) 인덱스 → RANKING_COLUMNS
+    백분위: 해당 월 총점이 이 센터 이하인 센터 비율 (%), 1위 = 100
+    총점이 없는 센터는 순위/백분위 없음 (<NA>/NaN), 센터수는 총점이 있는 센터 수
+    """
+    table: pd.DataFrame
+
+    def lookup(self, month: pd.Timestamp, center: str) -> Optional[pd.Series]:
+        """(평가월, 센터명) 순위 정보, 없으면 None"""
+        try:
+            return self.table.loc[(month, center)]
+        except KeyError:
+            return None
+
+    def for_month(self, month: pd.Timestamp) -> pd.DataFrame:
+        """해당 월 전체 센터 순위 (센터명 인덱스)"""
+        return self.table.xs(month, level='평가월')
+
+
+def build_ranking_index(df: pd.DataFrame) -> RankingIndex:
+    """점수 계산된 데이터로 월별 순위표 생성 (get_ranking_changes 기준)"""
+    ranked = get_ranking_changes(df[['평가월', '센터명', '총점']])
+
+    by_month = ranked.groupby('평가월')['총점']
+    ranked['센터수'] = by_month.transform('count')
+    ranked['백분위'] = by_month.rank(pct=True, method='max') * 100
+
+    table = ranked.set_index(['평가월', '센터명'])[RANKING_COLUMNS].sort_index()
+    return RankingIndex(table=table)
+
+
+@dataclass
+class AnalysisContext:
+    """
+    최신 월 기준 분석 결과 (읽기 전용으로 사용)
+
+    df_latest: 최신 월 행 + 예측점수, *_예측, 위험도, RANKING_COLUMNS (원본 순서 유지)
+    rankings: 전체 월 순위표
+    """
+    latest_month: pd.Timestamp
+    is_first_half: bool
+    period_month: int
+    df_latest: pd.DataFrame
+    rankings: RankingIndex
+
+    @property
+    def period_text(self) -> str:
+        half = "상반기" if self.is_first_half else "하반기"
+        return f"{half} {self.period_month}월"
+
+    @property
+    def center_count(self) -> int:
+        return len(self.df_latest)
+
+    def ranked(self) -> pd.DataFrame:
+        """현재 총점 순위순 정렬"""
+        return self.df_latest.sort_values('순위', kind='stable').reset_index(drop=True)
+
+
+def build_analysis_context(df: pd.DataFrame) -> AnalysisContext:
+    """
+    점수 계산된 데이터로 AnalysisContext 생성
+    """
+    latest_month = df['평가월'].max()
+    df_latest = df[df['평가월'] == latest_month].copy()
+
+    is_first_half, period_month = get_period_info(latest_month.month)
+
+    predictions = calculate_predicted_scores(df_latest, period_month)
+    df_latest['예측점수'] = predictions['예측총점']
+    df_latest[PREDICTION_COLUMNS] = predictions[PREDICTION_COLUMNS]
+    df_latest['위험도'] = classify_risk_levels(df_latest['예측점수'], period_month)
+
+    rankings = build_ranking_index(df)
+    latest_ranks = rankings.for_month(latest_month).reindex(df_latest['센터명'])
+    for col in RANKING_COLUMNS:
+        # .array: Int64 순위의 <NA>(총점 없는 센터)를 그대로 유지
+        df_latest[col] = latest_ranks[col].array
+
+    return AnalysisContext(
+        latest_month=latest_month,
+        is_first_half=is_first_half,
+        period_month=period_month,
+        df_latest=df_latest,
+        rankings=rankings,
+    )
+
+
+def _pairwise_moments(values: np.ndarray, codes: np.ndarray, n_groups: int) -> Tuple[np.ndarray, ...]:
+    """
+    그룹별 지표 쌍 합계 (그룹 수, 지표 수, 지표 수) 4개를 행렬곱 한 번으로 계산
+
+    결측은 쌍별 제외 (pandas corr와 같음): 그룹을 같은 길이로 0 채워 쌓은 뒤
+    n[i, j] = 둘 다 있는 행 수, sx[i, j] = Σx_i, sxx[i, j] = Σx_i², sxy[i, j] = Σx_i·x_j
+    """
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    positions = np.arange(len(codes)) - starts[sorted_codes]
+
+    padded = np.full((n_groups, max(sizes.max(initial=0), 1), values.shape[1]), np.nan)
+    padded[sorted_codes, positions] = values[order]
+
+    present = ~np.isnan(padded)
+    mask = present.astype(np.float64)
+    x = np.where(present, padded, 0.0)
+    x_t = x.transpose(0, 2, 1)
+
+    n = mask.transpose(0, 2, 1) @ mask
+    sx = x_t @ mask
+    sxx = (x_t * x_t) @ mask
+    sxy = x_t @ x
+    return n, sx, sxx, sxy
+
+
+def _correlation_from_moments(n, sx, sxx, sxy) -> np.ndarray:
+    """쌍별 합계 → 상관계수 (표본 2개 미만이거나 분산 0이면 NaN)"""
+    sy = sx.swapaxes(-1, -2)
+    var_x = n * sxx - sx * sx
+    var_y = var_x.swapaxes(-1, -2)
+    cov = n * sxy - sx * sy
+
+    # 상수 컬럼은 반올림 오차로 분산이 0에 가깝게 남으므로 상대 오차로 판정
+    scale_x = n * sxx
+    degenerate = (n < 2) | (var_x <= scale_x * 1e-12) | (var_y <= scale_x.swapaxes(-1, -2) * 1e-12)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[degenerate] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _group_correlations(values: np.ndarray, codes: np.ndarray, n_groups: int, method: str) -> np.ndarray:
+    """
+    그룹별 상관계수
+
+    Spearman은 그룹 안에서 지표별 평균 순위로 변환 후 계산
+    (결측은 지표별로 빼고 순위를 매기므로 결측이 있으면 pandas 쌍별 순위와 약간 다를 수 있음)
+    """
+    if method == 'spearman':
+        values = pd.DataFrame(values).groupby(codes).rank().to_numpy(dtype=np.float64)
+    return _correlation_from_moments(*_pairwise_moments(values, codes, n_groups))
+
+
+def _rolling_rows(month_codes: np.ndarray, n_months: int, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """행 → 속한 이동 창 번호 (한 행이 최대 window개 창에 포함되므로 행 번호를 반복)"""
+    n_windows = n_months - window + 1
+    rows, windows = [], []
+    for offset in range(window):
+        window_codes = month_codes - offset
+        valid = (window_codes >= 0) & (window_codes < n_windows)
+        rows.append(np.flatnonzero(valid))
+        windows.append(window_codes[valid])
+    return np.concatenate(rows), np.concatenate(windows)
+
+
+@dataclass
+class CorrelationSet:
+    """
+    지표 간 상관계수 (읽기 전용으로 사용)
+
+    matrices: (방법, 기준) → (기간 이름 목록, (기간 수, 지표 수, 지표 수) 배열)
+    방법은 CORRELATION_METHODS, 기준은 CORRELATION_SCOPES 중 하나
+    월별/이동 기간은 오래된 순, 이동 창은 연속된 평가월 ROLLING_CORRELATION_MONTHS개
+    """
+    columns: List[str]
+    matrices: Dict[Tuple[str, str], Tuple[List[str], np.ndarray]]
+
+    def labels(self, method: str, scope: str) -> List[str]:
+        return self.matrices[(method, scope)][0]
+
+    def matrix(self, method: str = 'pearson', scope: str = '전체', label: Optional[str] = None) -> pd.DataFrame:
+        """해당 기간 상관계수 행렬 (label 생략 시 가장 최근 기간)"""
+        labels, stack = self.matrices[(method, scope)]
+        position = len(labels) - 1 if label is None else labels.index(label)
+        return pd.DataFrame(stack[position], index=self.columns, columns=self.columns)
+
+
+def build_correlation_set(df: pd.DataFrame) -> Optional[CorrelationSet]:
+    """
+    점수 계산된 데이터로 전체/반기별/월별/이동 상관계수 일괄 계산 (지표 2개 미만이면 None)
+
+    Pearson은 평가월별 쌍별 합계를 한 번 구한 뒤 반기, 이동 창, 전체로 더해 계산
+    Spearman은 기준마다 순위가 달라지므로 기준별로 순위 변환 후 같은 방식으로 계산
+    """
+    columns = [col for col in CORRELATION_COLUMNS if col in df.columns]
+    if len(columns) < 2 or df.empty:
+        return None
+
+    values = df[columns].to_numpy(dtype=np.float64)
+    # 평균을 빼 두면 합계 기반 분산 계산의 자릿수 손실이 줄어듦 (상관계수는 그대로)
+    values = values - np.nanmean(values, axis=0)
+
+    month_codes, months = pd.factorize(df['평가월'].dt.to_period('M'), sort=True)
+    month_labels = [str(month) for month in months]
+
+    half_keys = [(month.year, get_period_info(month.month)[0]) for month in months]
+    half_of_month, halves = pd.factorize(pd.Series(half_keys, dtype=object), sort=False)
+    half_labels = [f"{year}년 {'상반기' if is_first_half else '하반기'}" for year, is_first_half in halves]
+    half_codes = half_of_month[month_codes]
+
+    window = ROLLING_CORRELATION_MONTHS
+    rolling_labels = [
+        f"{month_labels[start]} ~ {month_labels[start + window - 1]}"
+        for start in range(len(months) - window + 1)
+    ]
+
+    matrices = {}
+
+    # Pearson: 월별 합계 → 반기/이동/전체 합계
+    moments = np.stack(_pairwise_moments(values, month_codes, len(months)))
+    half_moments = np.zeros((4, len(halves)) + moments.shape[2:])
+    np.add.at(half_moments, (slice(None), half_of_month), moments)
+    pearson = {
+        '전체': (['전체'], moments.sum(axis=1, keepdims=True)),
+        '반기별': (half_labels, half_moments),
+        '월별': (month_labels, moments),
+    }
+    if rolling_labels:
+        windows = np.lib.stride_tricks.sliding_window_view(moments, window, axis=1).sum(axis=-1)
+        pearson[CORRELATION_SCOPES[3]] = (rolling_labels, windows)
+    else:
+        pearson[CORRELATION_SCOPES[3]] = ([], np.empty((4, 0) + moments.shape[2:]))
+    for scope, (labels, sums) in pearson.items():
+        matrices[('pearson', scope)] = (labels, _correlation_from_moments(*sums))
+
+    # Spearman: 기준별 순위
+    all_rows = np.zeros(len(values), dtype=np.intp)
+    matrices[('spearman', '전체')] = (['전체'], _group_correlations(values, all_rows, 1, 'spearman'))
+    matrices[('spearman', '반기별')] = (half_labels, _group_correlations(values, half_codes, len(halves), 'spearman'))
+    matrices[('spearman', '월별')] = (month_labels, _group_correlations(values, month_codes, len(months), 'spearman'))
+    rows, window_codes = _rolling_rows(month_codes, len(months), window)
+    matrices[('spearman', CORRELATION_SCOPES[3])] = (
+        rolling_labels,
+        _group_correlations(values[rows], window_codes, len(rolling_labels), 'spearman')
+        if rolling_labels else np.empty((0, len(columns), len(columns)))
+    )
+
+    return CorrelationSet(columns=columns, matrices=matrices)
+
+
+def strong_correlation_pairs(corr_matrix: pd.DataFrame, threshold: float = STRONG_CORRELATION) -> pd.DataFrame:
+    """상관계수 행렬 위쪽 삼각형에서 |r| > threshold인 지표 쌍 (지표1, 지표2, 상관계수)"""
+    rows, cols = np.triu_indices(len(corr_matrix.columns), k=1)
+    values = corr_matrix.to_numpy()[rows, cols]
+    strong = np.abs(values) > threshold
+
+    names = corr_matrix.columns.to_numpy()
+    return pd.DataFrame({
+        '지표1': names[rows[strong]],
+        '지표2': names[cols[strong]],
+        '상관계수': values[strong],
+    })
+
+
+def _half_labels(months: pd.Series) -> pd.Series:
+    """평가월 → 'YYYY년 상반기/하반기'"""
+    return months.dt.year.astype(str) + '년 ' + np.where(months.dt.month <= 6, '상반기', '하반기')
+
+
+@dataclass
+class OutlierReport:
+    """
+    이상치 탐지 결과 (읽기 전용으로 사용)
+
+    table: 이상치 1건당 1행 (OUTLIER_TABLE_COLUMNS), 지표 순 → 원본 행 순
+    bounds: 그룹 × 지표별 정상 범위 (그룹, 지표, 하한, 상한)
+    """
+    method: str
+    grouping: str
+    columns: List[str]
+    table: pd.DataFrame
+    bounds: pd.DataFrame
+
+    def summary(self) -> pd.DataFrame:
+        """이상치가 있는 지표별 건수, 센터 수 (전체 기준이면 정상 범위 포함)"""
+        counts = self.table.groupby('지표', sort=False).agg(
+            **{'이상치 건수': ('센터명', 'size'), '센터 수': ('센터명', 'nunique')}
+        )
+        summary = counts.reset_index()
+        if self.grouping == '전체':
+            bounds = self.bounds.set_index('지표').reindex(summary['지표'])
+            summary.insert(2, '정상 범위', [
+                f"{lower:.1f} ~ {upper:.1f}" for lower, upper in zip(bounds['하한'], bounds['상한'])
+            ])
+        summary['지표'] = summary['지표'].str.replace('_점수', '')
+        return summary
+
+
+def build_outlier_report(df: pd.DataFrame, method: str = 'iqr', grouping: str = '전체') -> Optional[OutlierReport]:
+    """
+    OUTLIER_COLUMNS 이상치 일괄 탐지 (분석할 지표가 없으면 None)
+
+    method: 'iqr' → Q1 - 1.5×IQR ~ Q3 + 1.5×IQR
+            'mad' → 중앙값 ± 3.5 × MAD / 0.6745 (MAD가 0이면 평균 절대편차 × 1.2533로 대체)
+    grouping: '전체' / '반기별' / '월별' - 같은 그룹 안의 값끼리 비교
+    분위수는 지표 전체를 한 번에 (그룹별이면 groupby 한 번으로) 계산
+    """
+    columns = [col for col in OUTLIER_COLUMNS if col in df.columns]
+    if not columns:
+        return None
+
+    if grouping == '월별':
+        group_keys = df['평가월'].dt.strftime('%Y-%m')
+    elif grouping == '반기별':
+        group_keys = _half_labels(df['평가월'])
+    else:
+        group_keys = pd.Series('전체', index=df.index)
+    codes, groups = pd.factorize(group_keys, sort=True)
+
+    values = df[columns].to_numpy(dtype=np.float64)
+    probs = [0.25, 0.5, 0.75]
+    if grouping == '전체':
+        quantiles = df[columns].quantile(probs).to_numpy(dtype=np.float64)[np.newaxis]
+    else:
+        quantiles = (
+            df[columns].groupby(codes).quantile(probs)
+            .to_numpy(dtype=np.float64).reshape(len(groups), len(probs), len(columns))
+        )
+    q1, median, q3 = quantiles[:, 0], quantiles[:, 1], quantiles[:, 2]
+
+    if method == 'mad':
+        deviations = pd.DataFrame(np.abs(values - median[codes]))
+        by_group = deviations.groupby(codes)
+        mad = by_group.median().to_numpy()
+        mean_ad = by_group.mean().to_numpy()
+        spread = np.where(mad > 0, mad / 0.6745, mean_ad * 1.253314)
+        lower = median - ROBUST_Z_THRESHOLD * spread
+        upper = median + ROBUST_Z_THRESHOLD * spread
+    else:
+        iqr = q3 - q1
+        lower = q1 - IQR_MULTIPLIER * iqr
+        upper = q3 + IQR_MULTIPLIER * iqr
+
+    row_lower, row_upper = lower[codes], upper[codes]
+    flagged = (values < row_lower) | (values > row_upper)
+    col_idx, row_idx = np.nonzero(flagged.T)
+
+    flagged_values = values[row_idx, col_idx]
+    table = pd.DataFrame({
+        '그룹': groups[codes[row_idx]],
+        '센터명': df['센터명'].to_numpy()[row_idx],
+        '평가월': df['평가월'].to_numpy()[row_idx],
+        '지표': np.asarray(columns, dtype=object)[col_idx],
+        '값': flagged_values,
+        '하한': row_lower[row_idx, col_idx],
+        '상한': row_upper[row_idx, col_idx],
+        '방향': np.where(flagged_values > row_upper[row_idx, col_idx], '높음', '낮음'),
+    }, columns=OUTLIER_TABLE_COLUMNS)
+
+    bounds = pd.DataFrame({
+        '그룹': np.repeat(np.asarray(groups, dtype=object), len(columns)),
+        '지표': np.tile(np.asarray(columns, dtype=object), len(groups)),
+        '하한': lower.ravel(),
+        '상한': upper.ravel(),
+    })
+
+    return OutlierReport(method=method, grouping=grouping, columns=columns, table=table, bounds=bounds)
+
+
+def build_trend_bands(df: pd.DataFrame, value_col: str) -> pd.DataFrame:
+    """
+    평가월별 센터 값 분포 (평가월 인덱스, TREND_BAND_QUANTILES 컬럼 + 센터수)
+
+    센터 수와 관계없이 평가월당 1행이므로 차트 데이터 크기가 일정
+    """
+    by_month = df.groupby('평가월', sort=True)[value_col]
+    bands = by_month.quantile(list(TREND_BAND_QUANTILES.values())).unstack()
+    bands.columns = list(TREND_BAND_QUANTILES)
+    bands['센터수'] = by_month.count()
+    return bands
+
+
+def extreme_centers(df: pd.DataFrame, value_col: str, count: int) -> Tuple[List[str], List[str]]:
+    """
+    최신 월 value_col 기준 상위/하위 count개 센터
+
+    반환값: (상위 센터 - 높은 순, 하위 센터 - 낮은 순), 상위에 포함된 센터는 하위에서 제외
+    """
+    if count <= 0 or df.empty:
+        return [], []
+
+    latest = df.loc[df['평가월'] == df['평가월'].max(), ['센터명', value_col]].dropna()
+    ranked = latest.sort_values(value_col, ascending=False, kind='stable')
+    top = ranked['센터명'].head(count).astype(str).tolist()
+    bottom = [center for center in ranked['센터명'].iloc[::-1].head(count).astype(str) if center not in top]
+    return top, bottom
@@ -6,15 +6,47 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import os
+import hashlib
 from io import BytesIO
 
 # 로컬 모듈
-from data_loader import load_cumulative_data, validate_cumulative_data
-from score_calculator import calculate_scores
+from data_loader import (
+    load_cumulative_data, validate_cumulative_data, load_monthly_increment,
+    read_excel_cached, excel_bytes, normalize_schema, LoadDiagnostics
+)
+from score_calculator import calculate_scores, calculate_predicted_scores, KPI_SPECS
+from analytics import (
+    build_analysis_context, build_correlation_set, strong_correlation_pairs, build_outlier_report,
+    get_period_info, RISK_STYLES, CORRELATION_METHODS, CORRELATION_SCOPES, STRONG_CORRELATION,
+    OUTLIER_METHODS, OUTLIER_GROUPINGS, build_trend_bands, extreme_centers
+)
+from dataset_registry import DatasetRegistry
+from history_store import HistoryStore, partition_label
+
+# 저장된 최신 데이터 경로
+LATEST_DATA_PATH = "data/latest_data.xlsx"
+
+# 연도/반기별 이력 저장소 (있으면 LATEST_DATA_PATH 대신 사용, python -m history_store 참고)
+HISTORY_STORE_PATH = "data/history"
+
+# 이력 저장소 조회 기간 → 읽을 최근 반기 수 (None: 전체)
+HISTORY_SCOPES = {'현재 반기': 1, '최근 1년': 2, '최근 3년': 6, '전체': None}
+DEFAULT_HISTORY_SCOPE = '현재 반기'
+
+# 월별 추이: 센터가 TREND_MAX_CENTER_LINES개보다 많으면 분포(중앙값·범위) 표시가 기본,
+# 센터별 선은 최신 월 상위/하위 센터만 기본 표시 (센터 수와 관계없이 차트 데이터 크기 제한)
+TREND_MODES = ['분포 (중앙값·범위)', '센터별 추이']
+TREND_MAX_CENTER_LINES = 12
+TREND_HIGHLIGHT_DEFAULT = 3
+TREND_HIGHLIGHT_MAX = 10
+
+# 서버 전체에서 보관할 데이터 버전 수 (GitHub 데이터 + 최근 업로드)
+DATASET_REGISTRY_SIZE = 8
 
 # 페이지 설정
 st.set_page_config(
@@ -195,10 +227,244 @@ def get_responsive_columns(desktop_cols=4, tablet_cols=2, mobile_cols=1):
     else:
         return desktop_cols
 
-@st.cache_data(ttl=3600, show_spinner=False)  # 1시간 캐시, 스피너 비활성화
+def get_data_key():
+    """현재 세션의 데이터 버전 + 필터 조건 (분석 결과 캐시 키)"""
+    return (st.session_state.get('data_version'), st.session_state.get('filter_key'))
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_registry():
+    """데이터 버전별 DataFrame 저장소 (서버 프로세스당 1개, 모든 세션 공유)"""
+    return DatasetRegistry(max_entries=DATASET_REGISTRY_SIZE)
+
+@st.cache_resource(max_entries=DATASET_REGISTRY_SIZE, show_spinner=False)
+def get_filter_options(_df: pd.DataFrame, data_version):
+    """
+    사이드바 필터 선택지 + 행별 평가월 번호 (데이터 버전당 1회 계산)
+    
+    반환값: (평가월 목록(Period, 오름차순), 센터 목록, 행별 평가월 목록 위치)
+    """
+    month_codes, months = pd.factorize(_df['평가월'].dt.to_period('M'), sort=True)
+    centers = sorted(_df['센터명'].unique())
+    return list(months), centers, month_codes
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_filtered_view(_df: pd.DataFrame, data_version, filter_key):
+    """
+    필터 결과 (데이터 버전 + 필터 조건당 1회 계산, 세션 간 공유하므로 수정하지 말 것)
+    
+    filter_key: (선택 평가월 'YYYY-MM' 정렬 튜플, 선택 센터 정렬 튜플)
+    """
+    months, _, month_codes = get_filter_options(_df, data_version)
+    selected_months, selected_centers = filter_key
+    
+    month_positions = [i for i, month in enumerate(months) if str(month) in selected_months]
+    mask = np.isin(month_codes, month_positions) & _df['센터명'].isin(selected_centers).to_numpy()
+    return _df[mask]
+
+@st.cache_resource(max_entries=DATASET_REGISTRY_SIZE, show_spinner=False)
+def get_history_index(data_version, partitions):
+    """
+    이력 저장소 센터명/평가월 목록 (데이터 버전당 1회, 필터 선택지와 데이터 요약용)
+    
+    전체 컬럼을 읽지 않고 사이드바를 구성하기 위해 사용
+    """
+    return HistoryStore(HISTORY_STORE_PATH).index(list(partitions))
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_history_view(data_version, partitions, filter_key):
+    """
+    이력 저장소에서 필터 조건에 맞는 행만 읽기 (세션 간 공유하므로 수정하지 말 것)
+    
+    평가월 조건은 반기 파일 선택 + 월 범위, 센터 조건은 row group 통계로 Parquet 읽기 단계에 적용
+    filter_key: get_filtered_view와 같은 형식
+    """
+    selected_months, selected_centers = filter_key
+    return HistoryStore(HISTORY_STORE_PATH).read(
+        list(partitions), months=list(selected_months), centers=list(selected_centers)
+    )
+
+def get_saved_dataset(registry: DatasetRegistry, version: str):
+    """저장된 데이터 전체 (버전당 1회 로드 후 registry에서 공유)"""
+    df = registry.get(version)
+    if df is None:
+        df_loaded = load_latest_data_from_github()
+        if df_loaded is not None:
+            df = registry.put(version, df_loaded)
+    return df
+
+def get_current_dataset():
+    """
+    현재 세션 데이터 버전의 공유 DataFrame (없거나 만료되었으면 None)
+    
+    세션에는 버전만 저장하므로 반환 객체는 수정하지 말 것
+    """
+    return get_dataset_registry().get(st.session_state.get('data_version'))
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_analysis_context(_df: pd.DataFrame, data_key):
+    return build_analysis_context(_df)
+
+def get_analysis_context(df: pd.DataFrame):
+    """
+    최신 월 분석 결과 (데이터 버전 + 필터 조건당 1회 계산, 세션 간 공유)
+    
+    반환 객체는 공유되므로 수정하지 말 것
+    """
+    return _cached_analysis_context(df, get_data_key())
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_correlation_set(_df: pd.DataFrame, data_key):
+    return build_correlation_set(_df)
+
+def get_correlation_set(df: pd.DataFrame):
+    """
+    전체/반기별/월별/이동 상관계수 (데이터 버전 + 필터 조건당 1회 계산, 세션 간 공유)
+    
+    DataFrame 내용을 해시하지 않고 get_data_key로 캐시
+    """
+    return _cached_correlation_set(df, get_data_key())
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_outlier_report(_df: pd.DataFrame, data_key, method, grouping):
+    return build_outlier_report(_df, method, grouping)
+
+def get_outlier_report(df: pd.DataFrame, method: str, grouping: str):
+    """이상치 탐지 결과 (데이터 버전 + 필터 조건 + 방법/비교 단위당 1회 계산, 세션 간 공유)"""
+    return _cached_outlier_report(df, get_data_key(), method, grouping)
+
+def get_upload_digest(uploaded_files) -> str:
+    """
+    업로드 파일(들) 내용 SHA-256 (같은 업로드는 세션 내에서 1회만 계산)
+    
+    여러 파일이면 파일별 해시를 업로드 순서대로 합쳐 다시 해시
+    """
+    digests = st.session_state.setdefault('upload_digests', {})
+    
+    file_ids = [f.file_id for f in uploaded_files]
+    for stale_id in set(digests) - set(file_ids):
+        del digests[stale_id]
+    
+    for uploaded_file in uploaded_files:
+        if uploaded_file.file_id not in digests:
+            digests[uploaded_file.file_id] = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    
+    if len(file_ids) == 1:
+        return digests[file_ids[0]]
+    return hashlib.sha256("".join(digests[file_id] for file_id in file_ids).encode()).hexdigest()
+
+def _named_buffer(name: str, content: bytes) -> BytesIO:
+    """파일 이름이 있는 BytesIO (형식 판별, 진행 메시지 표시용)"""
+    buffer = BytesIO(content)
+    buffer.name = name
+    return buffer
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def process_uploaded_workbook(upload_version: str, _files,
+                              base_version=None, _base_df=None):
+    """
+    업로드 파일 처리 (로딩 → 검증 → 점수 계산)
+    
+    _files: [(파일 이름, 내용 bytes)] - 여러 개면 병합 후 한 번에 계산
+    파일 내용 SHA-256 기반 버전을 키로 서버당 1회만 처리하고 최근 8개만 유지 (LRU)
+    추가 모드(_base_df 지정)는 기존 데이터 버전도 키에 포함
+    
+    반환값: (점수 데이터 또는 None, LoadDiagnostics, 검증 통과 여부, 오류 목록)
+    """
+    diagnostics = LoadDiagnostics()
+    source = [_named_buffer(name, content) for name, content in _files]
+    
+    if _base_df is not None:
+        # 추가 모드: 새 행만 점수 계산하지만, 반환값은 기존 데이터와 합친 전체 점수 데이터
+        # (그대로 새 데이터 버전으로 등록되므로 아래에서 다시 점수 계산하지 않음)
+        df = load_monthly_increment(source, _base_df, diagnostics)
+    else:
+        df = load_cumulative_data(source, diagnostics)
+    
+    if df is None:
+        return None, diagnostics, False, []
+    
+    is_valid, errors = validate_cumulative_data(df, diagnostics)
+    if not is_valid:
+        return None, diagnostics, False, errors
+    
+    if _base_df is None:
+        df = calculate_scores(df)
+    
+    return df, diagnostics, True, errors
+
+def render_diagnostics(diagnostics: LoadDiagnostics):
+    """데이터 로딩/검증 메시지 표시 (진행 안내는 한 블록으로 묶어서 표시)"""
+    infos = [m.text for m in diagnostics.by_level('info')]
+    
+    for message in diagnostics.messages:
+        if message.level == 'info':
+            continue
+        getattr(st, message.level)(message.text)
+        
+        if message.detail:
+            with st.expander("🔍 상세 오류 정보"):
+                st.code(message.detail)
+    
+    if infos:
+        st.info("\n".join(f"- {text}" for text in infos))
+    
+    report = diagnostics.validation_report
+    if report is not None and len(report) > 0:
+        with st.expander(f"🔍 검증 상세 ({len(report)}건)"):
+            st.dataframe(
+                report.assign(행=report['행'].map(format_row_refs)).rename(columns={'행': '데이터 순번'}),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption(
+                "데이터 순번은 불러온 데이터(여러 파일/시트면 병합 후)의 0부터 시작하는 번호입니다. "
+                "파일 1개, 시트 1개라면 엑셀 행 번호 = 순번 + 2 (머리글 1행)"
+            )
+
+def format_row_refs(rows, limit=10):
+    """위반 행 순번(df 인덱스 레이블) 목록 표시 (앞 limit개 + 나머지 건수)"""
+    shown = ", ".join(str(row) for row in rows[:limit])
+    return shown + (f" 외 {len(rows) - limit}행" if len(rows) > limit else "")
+
+def get_history_partitions():
+    """이력 저장소에서 현재 조회 기간에 해당하는 반기 목록 (저장소가 없으면 빈 목록)"""
+    store = HistoryStore(HISTORY_STORE_PATH)
+    scope = st.session_state.get('history_scope', DEFAULT_HISTORY_SCOPE)
+    return store, store.latest(HISTORY_SCOPES.get(scope, 1))
+
+def get_github_data_version():
+    """
+    저장된 데이터 버전
+    
+    이력 저장소: 조회 기간 반기 파일들의 크기 + 수정시각
+    그 외: LATEST_DATA_PATH 크기 + 수정시각
+    """
+    store, partitions = get_history_partitions()
+    if partitions:
+        return f"history:{store.version(partitions)}"
+    
+    try:
+        stat = os.stat(LATEST_DATA_PATH)
+        return f"github:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return "github:none"
+
 def load_latest_data_from_github():
-    """GitHub에 저장된 최신 데이터 로드 (개선된 버전)"""
-    data_path = "data/latest_data.xlsx"
+    """
+    GitHub에 저장된 최신 데이터 로드 (개선된 버전)
+    
+    이력 저장소가 있으면 조회 기간 반기 파일만 읽음
+    파일 버전당 1회만 호출되도록 get_dataset_registry()에 등록해서 사용
+    """
+    store, partitions = get_history_partitions()
+    if partitions:
+        try:
+            return store.read(partitions)
+        except Exception as e:
+            st.error(f"❌ 이력 저장소 로드 실패: {e}")
+            return None
+    
+    data_path = LATEST_DATA_PATH
     
     # 파일 존재 여부 확인
     if not os.path.exists(data_path):
@@ -211,8 +477,8 @@ def load_latest_data_from_github():
             st.error("❌ 데이터 파일이 비어있습니다.")
             return None
         
-        # 파일 읽기 시도
-        df = pd.read_excel(data_path, engine='openpyxl')
+        # 파일 읽기 시도 (Parquet 캐시가 유효하면 엑셀 파싱 생략)
+        df = read_excel_cached(data_path)
         
         # 데이터 유효성 검증
         if df.empty:
@@ -250,7 +516,7 @@ def load_latest_data_from_github():
                 st.error(f"❌ 점수 계산 실패: {e}")
                 return None
         
-        return df
+        return normalize_schema(df)
         
     except PermissionError:
         st.error("❌ 파일 접근 권한이 없습니다.")
@@ -268,75 +534,49 @@ def load_latest_data_from_github():
             st.code(traceback.format_exc())
         return None
 
-def convert_df_to_excel(df):
-    """DataFrame을 Excel 바이트로 변환"""
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_excel_bytes(_df: pd.DataFrame, export_key):
+    return excel_bytes(_df)
+
+def convert_df_to_excel(df, export_key):
+    """DataFrame을 Excel 바이트로 변환 (export_key당 1회 생성, 세션 간 공유)"""
     try:
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='성과데이터')
-        output.seek(0)
-        return output.getvalue()
+        return _cached_excel_bytes(df, export_key)
     except Exception as e:
         st.error(f"❌ Excel 변환 실패: {e}")
         return None
 
+def render_excel_download(df, export_key, label, file_name, help=None):
+    """
+    Excel 다운로드 버튼 (요청 시에만 생성)
+    
+    '파일 준비' 버튼을 누르기 전에는 변환하지 않고, 준비된 뒤에는 같은 export_key 동안
+    캐시된 바이트로 다운로드 버튼만 다시 그림
+    """
+    ready_keys = st.session_state.setdefault('excel_ready', {})
+    
+    if ready_keys.get(label) != export_key:
+        if not st.button("📦 Excel 파일 준비", key=f"prepare_excel_{label}", help=help):
+            return
+        ready_keys[label] = export_key
+    
+    with st.spinner("Excel 파일 생성 중..."):
+        excel_data = convert_df_to_excel(df, export_key)
+    
+    if excel_data:
+        st.download_button(
+            label=label,
+            data=excel_data,
+            file_name=file_name,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            help=help
+        )
+
 def calculate_predicted_score_v2(row, current_month):
-    """개선된 예측 점수 계산"""
+    """개선된 예측 점수 계산 (단일 센터, 일괄 예측 래퍼)"""
     try:
-        if current_month >= 6:
-            return {
-                '예측총점': row['총점'],
-                '안전점검_예측': row.get('안전점검_점수', 0),
-                '중점고객_예측': row.get('중점고객_점수', 0),
-                '사용계약_예측': row.get('사용계약_점수', 0),
-                '상담응대_예측': row.get('상담응대_점수', 0),
-                '상담기여_예측': row.get('상담기여_점수', 0),
-                '만족도_예측': row.get('만족도_점수', 0),
-                '조정항목': row.get('민원대응적정성', 0) + row.get('주의경고', 0) + row.get('가점', 0)
-            }
-        
-        progress_rate = current_month / 6
-        
-        안전점검_현재 = row.get('안전점검_점수', 0)
-        중점고객_현재 = row.get('중점고객_점수', 0)
-        사용계약_현재 = row.get('사용계약_점수', 0)
-        
-        안전점검_예측 = min(안전점검_현재 / progress_rate, 550)
-        중점고객_예측 = min(중점고객_현재 / progress_rate, 100)
-        사용계약_예측 = min(사용계약_현재 * 1.1, 50)
-        
-        상담응대_현재 = row.get('상담응대_점수', 0)
-        상담기여_현재 = row.get('상담기여_점수', 0)
-        만족도_현재 = row.get('만족도_점수', 0)
-        
-        상담응대_예측 = 상담응대_현재
-        상담기여_예측 = 상담기여_현재
-        만족도_예측 = 만족도_현재
-        
-        조정항목 = row.get('민원대응적정성', 0) + row.get('주의경고', 0) + row.get('가점', 0)
-        
-        예측총점 = (
-            안전점검_예측 + 
-            중점고객_예측 + 
-            사용계약_예측 + 
-            상담응대_예측 + 
-            상담기여_예측 + 
-            만족도_예측 + 
-            조정항목
-        )
-        
-        예측총점 = min(예측총점, 1000)
-        
-        return {
-            '예측총점': 예측총점,
-            '안전점검_예측': 안전점검_예측,
-            '중점고객_예측': 중점고객_예측,
-            '사용계약_예측': 사용계약_예측,
-            '상담응대_예측': 상담응대_예측,
-            '상담기여_예측': 상담기여_예측,
-            '만족도_예측': 만족도_예측,
-            '조정항목': 조정항목
-        }
+        frame = row.to_frame().T.infer_objects()
+        return calculate_predicted_scores(frame, current_month).iloc[0].to_dict()
     except Exception as e:
         st.error(f"❌ 예측 점수 계산 오류: {e}")
         return {
@@ -350,31 +590,6 @@ def calculate_predicted_score_v2(row, current_month):
             '조정항목': 0
         }
 
-def get_risk_level(predicted_score, current_month):
-    """예측 점수 기반 위험도 판정"""
-    gap = predicted_score - 911
-    
-    if current_month >= 6:
-        if gap >= 0:
-            return "안전", "#28a745", "🟢"
-        elif gap >= -30:
-            return "주의", "#ffc107", "🟡"
-        elif gap >= -60:
-            return "경고", "#fd7e14", "🟠"
-        else:
-            return "심각", "#dc3545", "🔴"
-    else:
-        if gap >= 50:
-            return "안전", "#28a745", "🟢"
-        elif gap >= 0:
-            return "양호", "#20c997", "🟢"
-        elif gap >= -30:
-            return "주의", "#ffc107", "🟡"
-        elif gap >= -60:
-            return "경고", "#fd7e14", "🟠"
-        else:
-            return "위험", "#dc3545", "🔴"
-
 # ==================== 사이드바 네비게이션 ====================
 
 def sidebar_navigation():
@@ -411,44 +626,57 @@ def sidebar_navigation():
 
 # ==================== 데이터 분석 함수들 ====================
 
-@st.cache_data(ttl=3600, max_entries=10, show_spinner=False)
-def calculate_correlation_matrix(df: pd.DataFrame):
-    """지표 간 상관관계 매트릭스 계산"""
-    try:
-        numeric_cols = [
-            '안전점검_점수', '중점고객_점수', '사용계약_점수',
-            '상담응대_점수', '상담기여_점수', '만족도_점수'
-        ]
-        
-        available_cols = [col for col in numeric_cols if col in df.columns]
-        
-        if len(available_cols) >= 2:
-            return df[available_cols].corr()
-        return None
-    except Exception as e:
-        st.error(f"❌ 상관관계 계산 오류: {e}")
-        return None
-
 def show_correlation_analysis(df: pd.DataFrame):
     """📊 지표 간 상관관계 분석"""
     st.subheader("📊 지표 간 상관관계 분석")
     
-    with st.spinner("🔍 상관관계 분석 중..."):
-        corr_matrix = calculate_correlation_matrix(df)
+    try:
+        with st.spinner("🔍 상관관계 분석 중..."):
+            correlations = get_correlation_set(df)
+    except Exception as e:
+        st.error(f"❌ 상관관계 계산 오류: {e}")
+        return
     
-    if corr_matrix is None:
+    if correlations is None:
         st.warning("⚠️ 상관관계 분석을 위한 데이터가 부족합니다.")
         return
     
     device = get_device_type()
     
+    col_scope, col_method, col_period = st.columns(3) if device != 'mobile' else (st.container(),) * 3
+    with col_scope:
+        scope = st.selectbox("분석 기준", options=CORRELATION_SCOPES, key='correlation_scope')
+    with col_method:
+        method = st.selectbox(
+            "상관계수",
+            options=list(CORRELATION_METHODS),
+            format_func=CORRELATION_METHODS.get,
+            key='correlation_method',
+            help="Spearman은 순위 기준이라 이상치와 비선형 관계에 덜 민감합니다."
+        )
+    
+    labels = correlations.labels(method, scope)
+    if not labels:
+        st.warning(f"⚠️ '{scope}' 분석을 위한 평가월이 부족합니다.")
+        return
+    with col_period:
+        # 기본값: 가장 최근 기간
+        period = st.selectbox(
+            "기간",
+            options=labels[::-1],
+            disabled=len(labels) == 1,
+            key=f'correlation_period_{scope}'
+        )
+    
+    corr_matrix = correlations.matrix(method, scope, period)
+    
     try:
         if device == 'mobile':
             fig = px.imshow(
                 corr_matrix,
                 text_auto='.2f',
                 color_continuous_scale='RdBu_r',
-                title="지표 간 상관계수",
+                title=f"지표 간 상관계수 ({period})",
                 labels=dict(color="상관계수"),
                 aspect='auto'
             )
@@ -464,7 +692,7 @@ def show_correlation_analysis(df: pd.DataFrame):
                     corr_matrix,
                     text_auto='.2f',
                     color_continuous_scale='RdBu_r',
-                    title="지표 간 상관계수",
+                    title=f"지표 간 상관계수 ({period})",
                     labels=dict(color="상관계수")
                 )
                 fig.update_layout(height=500)
@@ -480,21 +708,17 @@ def show_strong_correlations(corr_matrix):
     st.markdown("### 🔍 강한 상관관계")
     
     try:
-        strong_corr = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_value = corr_matrix.iloc[i, j]
-                if abs(corr_value) > 0.7:
-                    strong_corr.append({
-                        '지표1': corr_matrix.columns[i].replace('_점수', ''),
-                        '지표2': corr_matrix.columns[j].replace('_점수', ''),
-                        '상관계수': f"{corr_value:.3f}",
-                        '관계': '양의 상관' if corr_value > 0 else '음의 상관'
-                    })
-        
-        if strong_corr:
+        pairs = strong_correlation_pairs(corr_matrix, STRONG_CORRELATION)
+        strong_corr = pd.DataFrame({
+            '지표1': pairs['지표1'].str.replace('_점수', ''),
+            '지표2': pairs['지표2'].str.replace('_점수', ''),
+            '상관계수': pairs['상관계수'].map('{:.3f}'.format),
+            '관계': np.where(pairs['상관계수'] > 0, '양의 상관', '음의 상관')
+        })
+        
+        if not strong_corr.empty:
             st.dataframe(
-                pd.DataFrame(strong_corr),
+                strong_corr,
                 use_container_width=True,
                 hide_index=True
             )
@@ -510,86 +734,79 @@ def show_strong_correlations(corr_matrix):
         st.error(f"❌ 상관관계 분석 오류: {e}")
 
 def detect_outliers(df: pd.DataFrame):
-    """🔍 IQR 기반 이상치 탐지"""
+    """🔍 IQR / 로버스트 z 기반 이상치 탐지"""
     st.subheader("🔍 이상치 탐지")
     
     try:
+        device = get_device_type()
+        col_method, col_grouping = st.columns(2) if device != 'mobile' else (st.container(),) * 2
+        with col_method:
+            method = st.selectbox(
+                "탐지 방법",
+                options=list(OUTLIER_METHODS),
+                format_func=OUTLIER_METHODS.get,
+                key='outlier_method',
+                help="로버스트 z는 중앙값과 MAD 기준이라 이상치 자체의 영향을 덜 받습니다."
+            )
+        with col_grouping:
+            grouping = st.selectbox(
+                "비교 단위",
+                options=OUTLIER_GROUPINGS,
+                key='outlier_grouping',
+                help="같은 반기/평가월 안의 센터끼리 비교합니다."
+            )
+        
         with st.spinner("🔍 이상치 분석 중..."):
-            numeric_cols = ['총점', '안전점검_점수', '중점고객_점수', '사용계약_점수']
-            available_cols = [col for col in numeric_cols if col in df.columns]
+            report = get_outlier_report(df, method, grouping)
             
-            if not available_cols:
+            if report is None:
                 st.warning("⚠️ 분석 가능한 데이터가 없습니다.")
                 return
             
-            outliers_detected = []
-            
-            for col in available_cols:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-                
-                if len(outliers) > 0:
-                    outliers_detected.append({
-                        '지표': col.replace('_점수', ''),
-                        '이상치 건수': len(outliers),
-                        '정상 범위': f"{lower_bound:.1f} ~ {upper_bound:.1f}",
-                        '센터 수': outliers['센터명'].nunique()
-                    })
-        
-        if outliers_detected:
-            st.warning(f"⚠️ {len(outliers_detected)}개 지표에서 이상치 발견")
+            df_outliers = report.summary()
+        
+        if not df_outliers.empty:
+            st.warning(f"⚠️ {len(df_outliers)}개 지표에서 이상치 발견")
             
-            df_outliers = pd.DataFrame(outliers_detected)
             st.dataframe(df_outliers, use_container_width=True, hide_index=True)
             
-            device = get_device_type()
-            
             if device == 'mobile':
                 with st.expander("📊 이상치 상세 보기"):
-                    show_outlier_details(df, available_cols)
+                    show_outlier_details(report)
             else:
-                show_outlier_details(df, available_cols)
+                show_outlier_details(report)
         else:
             st.success("✅ 이상치가 발견되지 않았습니다.")
         
-        st.caption("""
-        💡 **IQR(Interquartile Range) 방식**
-        - 정상 범위: Q1 - 1.5×IQR ~ Q3 + 1.5×IQR
-        - 이상치: 정상 범위를 벗어난 값
-        """)
+        if method == 'mad':
+            st.caption("""
+            💡 **로버스트 z(MAD) 방식**
+            - 수정 z = 0.6745 × (값 - 중앙값) / MAD (MAD: 중앙값과의 차이의 중앙값)
+            - 이상치: |수정 z| > 3.5
+            """)
+        else:
+            st.caption("""
+            💡 **IQR(Interquartile Range) 방식**
+            - 정상 범위: Q1 - 1.5×IQR ~ Q3 + 1.5×IQR
+            - 이상치: 정상 범위를 벗어난 값
+            """)
     except Exception as e:
         st.error(f"❌ 이상치 탐지 오류: {e}")
 
-def show_outlier_details(df: pd.DataFrame, cols: list):
-    """이상치 상세 정보 표시"""
+def show_outlier_details(report, limit=5):
+    """이상치 상세 정보 표시 (지표별 최대 limit건)"""
     try:
-        for col in cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
+        table = report.table
+        # 비교 단위가 전체가 아니면 어느 반기/평가월 기준 이상치인지 함께 표시
+        suffix = '' if report.grouping == '전체' else ' (' + table['그룹'] + ')'
+        lines = '- ' + table['센터명'].astype(str) + ': ' + table['값'].map('{:.1f}점'.format) + suffix
+        
+        for col, positions in table.groupby('지표', sort=False).indices.items():
+            st.markdown(f"**{col.replace('_점수', '')} 이상치 센터:**")
+            st.markdown("\n".join(lines.iloc[positions[:limit]]))
             
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-            
-            if len(outliers) > 0:
-                st.markdown(f"**{col.replace('_점수', '')} 이상치 센터:**")
-                outlier_list = []
-                for _, row in outliers.iterrows():
-                    outlier_list.append(
-                        f"- {row['센터명']}: {row[col]:.1f}점"
-                    )
-                st.markdown("\n".join(outlier_list[:5]))
-                
-                if len(outliers) > 5:
-                    st.caption(f"... 외 {len(outliers)-5}개")
+            if len(positions) > limit:
+                st.caption(f"... 외 {len(positions)-limit}개")
     except Exception as e:
         st.error(f"❌ 이상치 상세 정보 표시 오류: {e}")
 
@@ -599,8 +816,7 @@ def analyze_score_distribution(df: pd.DataFrame):
     
     try:
         with st.spinner("📊 분포 분석 중..."):
-            latest_month = df['평가월'].max()
-            df_latest = df[df['평가월'] == latest_month]
+            df_latest = get_analysis_context(df).df_latest
             
             device = get_device_type()
             
@@ -701,26 +917,13 @@ def show_overview(df: pd.DataFrame):
             st.error(f"❌ 필수 컬럼 누락: {missing}")
             return
         
-        latest_month = df['평가월'].max()
-        df_latest = df[df['평가월'] == latest_month].copy()
-        
-        current_month = latest_month.month
-        is_first_half = current_month <= 6
-        period_month = current_month if is_first_half else current_month - 6
-        
         with st.spinner("🔮 예측 점수 계산 중..."):
-            prediction_results = df_latest.apply(
-                lambda row: calculate_predicted_score_v2(row, period_month),
-                axis=1
-            )
+            ctx = get_analysis_context(df)
         
-        df_latest['예측점수'] = prediction_results.apply(lambda x: x['예측총점'])
-        df_latest['안전점검_예측'] = prediction_results.apply(lambda x: x['안전점검_예측'])
-        df_latest['중점고객_예측'] = prediction_results.apply(lambda x: x['중점고객_예측'])
-        df_latest['사용계약_예측'] = prediction_results.apply(lambda x: x['사용계약_예측'])
-        df_latest['상담응대_예측'] = prediction_results.apply(lambda x: x['상담응대_예측'])
-        df_latest['상담기여_예측'] = prediction_results.apply(lambda x: x['상담기여_예측'])
-        df_latest['만족도_예측'] = prediction_results.apply(lambda x: x['만족도_예측'])
+        df_latest = ctx.df_latest
+        latest_month = ctx.latest_month
+        period_month = ctx.period_month
+        period_text = ctx.period_text
         
         device = get_device_type()
         col_count = get_responsive_columns(desktop_cols=4, tablet_cols=2, mobile_cols=2)
@@ -751,7 +954,6 @@ def show_overview(df: pd.DataFrame):
         
         if col_count >= 3:
             with cols[2]:
-                period_text = f"상반기 {period_month}월" if is_first_half else f"하반기 {period_month}월"
                 st.metric(
                     label="📅 현재 진행",
                     value=period_text,
@@ -780,8 +982,7 @@ def show_overview(df: pd.DataFrame):
         
         st.subheader(f"🏆 센터별 현재 점수 및 예측 ({latest_month.strftime('%Y년 %m월')} 기준)")
         
-        df_sorted = df_latest.sort_values('총점', ascending=False).reset_index(drop=True)
-        df_sorted['순위'] = range(1, len(df_sorted) + 1)
+        df_sorted = ctx.ranked()
         
         df_chart = df_sorted.sort_values('총점', ascending=True)
         
@@ -855,11 +1056,11 @@ def show_overview(df: pd.DataFrame):
         st.plotly_chart(fig, use_container_width=True)
         
         with st.expander("📋 상세 점수표 보기 (예측 점수 포함)"):
-            display_cols = ['순위', '센터명', '총점', '예측점수', '목표대비', 
+            display_cols = ['순위', '순위변동_표시', '센터명', '총점', '예측점수', '목표대비', 
                            '안전점검_점수', '중점고객_점수', '사용계약_점수',
                            '상담응대_점수', '상담기여_점수', '만족도_점수']
             
-            df_display = df_sorted[display_cols].copy()
+            df_display = df_sorted[display_cols].rename(columns={'순위변동_표시': '순위변동'})
             df_display['목표대비'] = (df_display['예측점수'] - 911).round(1)
             
             st.dataframe(
@@ -884,33 +1085,117 @@ def show_overview(df: pd.DataFrame):
         with st.expander("🔍 상세 오류 정보"):
             st.code(traceback.format_exc())
 
+def build_trend_figure(df: pd.DataFrame, value_col: str, mode: str, centers: list,
+                       highlight_count: int = 0, title: str = '', y_label: str = ''):
+    """
+    월별 추이 차트 (WebGL Scattergl)
+    
+    - 분포: 평가월별 최소~최대 / Q1~Q3 범위 + 중앙값 + 최신 월 상위/하위 highlight_count개 + centers
+    - 센터별 추이: centers 센터별 선
+    """
+    fig = go.Figure()
+    
+    if mode == TREND_MODES[0]:
+        bands = build_trend_bands(df, value_col)
+        x = bands.index
+        for upper, lower, name, opacity in [('최대', '최소', '최소~최대', 0.12), ('Q3', 'Q1', '사분위 범위 (Q1~Q3)', 0.3)]:
+            fig.add_trace(go.Scattergl(
+                x=x, y=bands[upper], mode='lines', line=dict(width=0),
+                showlegend=False, hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scattergl(
+                x=x, y=bands[lower], mode='lines', line=dict(width=0),
+                fill='tonexty', fillcolor=f'rgba(102, 126, 234, {opacity})',
+                name=name, customdata=bands[upper],
+                hovertemplate=f'{name}: %{{y:.1f}} ~ %{{customdata:.1f}}<extra></extra>'
+            ))
+        fig.add_trace(go.Scattergl(
+            x=x, y=bands['중앙값'], mode='lines+markers',
+            line=dict(color='#667eea', width=3), name='중앙값',
+            customdata=bands['센터수'],
+            hovertemplate='중앙값: %{y:.1f} (센터 %{customdata}개)<extra></extra>'
+        ))
+        
+        top, bottom = extreme_centers(df, value_col, highlight_count)
+        styles = {center: ('#28a745', f'▲ {center}') for center in top}
+        styles.update({center: ('#dc3545', f'▼ {center}') for center in bottom})
+        styles.update({center: (None, center) for center in centers if center not in styles})
+    else:
+        styles = {center: (None, center) for center in centers}
+    
+    df_lines = df[df['센터명'].isin(list(styles))].sort_values(['센터명', '평가월'], kind='stable')
+    for center, part in df_lines.groupby(df_lines['센터명'].astype(str), sort=True):
+        color, name = styles[center]
+        fig.add_trace(go.Scattergl(
+            x=part['평가월'], y=part[value_col], mode='lines+markers',
+            line=dict(color=color, width=2) if color else dict(width=2),
+            name=name, hovertemplate=f'{center}: %{{y:.1f}}<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title='평가월',
+        yaxis_title=y_label,
+        # 선이 많으면 x unified 툴팁이 화면을 가리므로 가장 가까운 점만 표시
+        hovermode='x unified' if len(styles) <= TREND_MAX_CENTER_LINES else 'closest'
+    )
+    return fig
+
 def show_trend_analysis(df: pd.DataFrame):
     """월별 추이 분석"""
     try:
         st.subheader("🎯 센터별 추이 비교")
         
-        # 전체 센터를 기본값으로 설정
-        centers = st.multiselect(
-            "비교할 센터 선택",
-            options=sorted(df['센터명'].unique()),
-            default=sorted(df['센터명'].unique()),
-            help="비교하고 싶은 센터를 선택하세요. 기본값은 전체 센터입니다."
+        center_names = [str(center) for center in sorted(df['센터명'].unique())]
+        many_centers = len(center_names) > TREND_MAX_CENTER_LINES
+        
+        # 센터가 많으면 분포 표시가 기본 (센터별 선 수백 개는 브라우저가 멈춤)
+        mode = st.radio(
+            "표시 방식",
+            options=TREND_MODES,
+            index=0 if many_centers else 1,
+            horizontal=True,
+            key='trend_mode',
+            help="분포는 평가월별 전체 센터의 중앙값, 사분위 범위, 최소~최대를 한 번에 보여줍니다."
         )
         
-        if not centers:
-            st.warning("⚠️ 센터를 선택하세요.")
-            return
-        
-        df_filtered = df[df['센터명'].isin(centers)]
+        if mode == TREND_MODES[0]:
+            highlight_count = st.slider(
+                "최신 월 상위/하위 강조 센터 수",
+                min_value=0,
+                max_value=TREND_HIGHLIGHT_MAX,
+                value=TREND_HIGHLIGHT_DEFAULT,
+                key='trend_highlight'
+            )
+            centers = st.multiselect(
+                "추가로 표시할 센터",
+                options=center_names,
+                default=[],
+                key='trend_extra_centers'
+            )
+        else:
+            highlight_count = 0
+            # 센터가 많으면 최신 월 총점 상위/하위 센터만 기본 선택
+            if many_centers:
+                top, bottom = extreme_centers(df, '총점', TREND_HIGHLIGHT_DEFAULT)
+                default_centers = sorted(top + bottom)
+            else:
+                default_centers = center_names
+            centers = st.multiselect(
+                "비교할 센터 선택",
+                options=center_names,
+                default=default_centers,
+                key='trend_centers',
+                help="비교하고 싶은 센터를 선택하세요. 센터가 많으면 최신 월 상위/하위 센터가 기본값입니다."
+            )
+            
+            if not centers:
+                st.warning("⚠️ 센터를 선택하세요.")
+                return
         
-        fig = px.line(
-            df_filtered,
-            x='평가월',
-            y='총점',
-            color='센터명',
-            markers=True,
-            title='센터별 월별 총점 추이',
-            labels={'총점': '총점 (점)', '평가월': '평가월'}
+        fig = build_trend_figure(
+            df, '총점', mode, centers, highlight_count,
+            title='센터별 월별 총점 추이', y_label='총점 (점)'
         )
         
         fig.add_hline(
@@ -924,7 +1209,6 @@ def show_trend_analysis(df: pd.DataFrame):
         
         fig.update_layout(
             height=500,
-            hovermode='x unified',
             legend=dict(
                 orientation="v",
                 yanchor="top",
@@ -956,21 +1240,13 @@ def show_trend_analysis(df: pd.DataFrame):
         
         kpi_col = kpi_options[selected_kpi]
         
-        if kpi_col in df_filtered.columns:
-            fig2 = px.line(
-                df_filtered,
-                x='평가월',
-                y=kpi_col,
-                color='센터명',
-                markers=True,
-                title=f'{selected_kpi} 월별 추이',
-                labels={kpi_col: f'{selected_kpi} 점수', '평가월': '평가월'}
+        if kpi_col in df.columns:
+            fig2 = build_trend_figure(
+                df, kpi_col, mode, centers, highlight_count,
+                title=f'{selected_kpi} 월별 추이', y_label=f'{selected_kpi} 점수'
             )
             
-            fig2.update_layout(
-                height=400,
-                hovermode='x unified'
-            )
+            fig2.update_layout(height=400)
             
             st.plotly_chart(fig2, use_container_width=True)
     except Exception as e:
@@ -999,9 +1275,7 @@ def show_center_detail(df: pd.DataFrame):
         
         latest = df_center.iloc[-1]
         
-        current_month = latest['평가월'].month
-        is_first_half = current_month <= 6
-        period_month = current_month if is_first_half else current_month - 6
+        is_first_half, period_month = get_period_info(latest['평가월'].month)
         
         prediction = calculate_predicted_score_v2(latest, period_month)
         predicted_score = prediction['예측총점']
@@ -1035,13 +1309,21 @@ def show_center_detail(df: pd.DataFrame):
         
         if col_count >= 3:
             with cols[2]:
-                latest_month_df = df[df['평가월'] == df['평가월'].max()]
-                rank = (latest_month_df['총점'] >= latest['총점']).sum()
-                st.metric(
-                    label="전체 순위",
-                    value=f"{rank}위",
-                    delta=f"/ {df['센터명'].nunique()}개"
-                )
+                ranking = get_analysis_context(df).rankings.lookup(latest['평가월'], center_name)
+                if ranking is None or pd.isna(ranking['순위']):
+                    # 총점이 없는 달은 순위를 매기지 않음
+                    st.metric(
+                        label="전체 순위",
+                        value="-",
+                        help="이 달 총점이 없어 순위가 산정되지 않았습니다."
+                    )
+                else:
+                    st.metric(
+                        label="전체 순위",
+                        value=f"{ranking['순위']}위",
+                        delta=f"/ {ranking['센터수']}개",
+                        help=f"전월 대비 {ranking['순위변동_표시']} · 백분위 {ranking['백분위']:.0f}"
+                    )
         
         if col_count >= 4:
             with cols[3]:
@@ -1056,18 +1338,11 @@ def show_center_detail(df: pd.DataFrame):
         
         st.subheader("📊 항목별 점수 (레이더 차트)")
         
-        categories = ['안전점검', '중점고객', '사용계약', '상담응대', '상담기여', '만족도']
+        categories = [spec['name'] for spec in KPI_SPECS]
         
-        scores = [
-            latest.get('안전점검_점수', 0),
-            latest.get('중점고객_점수', 0),
-            latest.get('사용계약_점수', 0),
-            latest.get('상담응대_점수', 0),
-            latest.get('상담기여_점수', 0),
-            latest.get('만족도_점수', 0)
-        ]
+        scores = [latest.get(f"{spec['name']}_점수", 0) for spec in KPI_SPECS]
         
-        max_scores = [550, 100, 50, 100, 100, 100]
+        max_scores = [spec['max'] for spec in KPI_SPECS]
         
         normalized_scores = [s/m*100 for s, m in zip(scores, max_scores)]
         
@@ -1100,22 +1375,11 @@ def show_center_detail(df: pd.DataFrame):
 def show_risk_management(df: pd.DataFrame):
     """위험 관리"""
     try:
-        latest_month = df['평가월'].max()
-        df_latest = df[df['평가월'] == latest_month].copy()
-        
-        current_month = latest_month.month
-        is_first_half = current_month <= 6
-        period_month = current_month if is_first_half else current_month - 6
-        
         with st.spinner("🔮 위험도 분석 중..."):
-            prediction_results = df_latest.apply(
-                lambda row: calculate_predicted_score_v2(row, period_month),
-                axis=1
-            )
-            
-            df_latest['예측점수'] = prediction_results.apply(lambda x: x['예측총점'])
+            ctx = get_analysis_context(df)
         
-        risk_centers = df_latest[df_latest['예측점수'] < 911].copy()
+        df_latest = ctx.df_latest
+        risk_centers = df_latest[df_latest['예측점수'] < 911]
         
         if len(risk_centers) == 0:
             st.success("🎉 모든 센터가 목표 달성 예상입니다!")
@@ -1124,7 +1388,8 @@ def show_risk_management(df: pd.DataFrame):
         st.warning(f"⚠️ **{len(risk_centers)}개 센터**가 목표 점수 미달 예상")
         
         for _, row in risk_centers.iterrows():
-            risk_level, color, icon = get_risk_level(row['예측점수'], period_month)
+            risk_level = row['위험도']
+            color, icon = RISK_STYLES[risk_level]
             
             with st.container():
                 st.markdown(f"""
@@ -1201,15 +1466,12 @@ def show_raw_data_verification(df: pd.DataFrame):
             height=600
         )
         
-        excel_data = convert_df_to_excel(df)
-        
-        if excel_data:
-            st.download_button(
-                label="💾 데이터 다운로드 (Excel)",
-                data=excel_data,
-                file_name=f"dashboard_data_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        render_excel_download(
+            df,
+            get_data_key(),
+            label="💾 데이터 다운로드 (Excel)",
+            file_name=f"dashboard_data_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
+        )
     except Exception as e:
         st.error(f"❌ 데이터 표시 오류: {e}")
 
@@ -1223,21 +1485,46 @@ def main():
         st.markdown('<div class="main-header">🏢 도시가스 고객센터 성과 대시보드</div>', 
                     unsafe_allow_html=True)
         
-        # 세션 상태 초기화 - 개선된 버전
-        if 'df' not in st.session_state or st.session_state.get('df') is None:
+        # 현재 세션 데이터 (서버 공유 저장소에서 버전으로 조회)
+        registry = get_dataset_registry()
+        df_current = get_current_dataset()
+        github_version = get_github_data_version()
+        history_store, history_partitions = get_history_partitions()
+        previous_version = st.session_state.get('data_version')
+        
+        # 저장된 데이터를 보는 중에 조회 기간이 바뀌었으면 다시 로드
+        if previous_version is not None and 'upload:' not in previous_version:
+            if previous_version != github_version:
+                df_current = None
+        
+        # 사이드바 요약/필터 선택지 기준 (센터명, 평가월만 있으면 됨)
+        data_index = df_current
+        
+        if history_partitions and previous_version == github_version:
+            # 이력 저장소: 전체 데이터는 필터가 없을 때만 로드 (아래 필터 단계)
+            data_index = get_history_index(github_version, tuple(history_partitions))
+        elif df_current is None:
+            if previous_version is not None and 'upload:' in previous_version:
+                st.warning("⚠️ 업로드한 데이터가 서버 캐시에서 만료되어 저장된 데이터를 표시합니다. 필요하면 다시 업로드하세요.")
+            
             with st.spinner("📊 데이터 로드 중..."):
                 try:
-                    df_github = load_latest_data_from_github()
-                    st.session_state['df'] = df_github
+                    if history_partitions:
+                        data_index = get_history_index(github_version, tuple(history_partitions))
+                    else:
+                        df_current = get_saved_dataset(registry, github_version)
+                        data_index = df_current
+                    
+                    st.session_state['data_version'] = github_version if data_index is not None else None
                     
-                    if df_github is not None:
+                    if data_index is not None:
                         st.success("✅ 데이터 로드 완료!", icon="✅")
                     else:
                         st.info("💡 저장된 데이터가 없습니다. 사이드바에서 새 데이터를 업로드해주세요.")
                         
                 except Exception as e:
                     st.error(f"❌ 데이터 로드 중 오류: {e}")
-                    st.session_state['df'] = None
+                    st.session_state['data_version'] = None
         
         # ⭐ 사이드바 네비게이션 (최상단 배치)
         selected_page = sidebar_navigation()
@@ -1246,9 +1533,24 @@ def main():
         with st.sidebar:
             st.header("📂 데이터 관리")
             
+            # 이력 저장소 조회 기간 (선택한 기간의 반기 파일만 읽음)
+            if history_partitions:
+                st.selectbox(
+                    "📅 조회 기간",
+                    list(HISTORY_SCOPES),
+                    index=list(HISTORY_SCOPES).index(DEFAULT_HISTORY_SCOPE),
+                    key='history_scope',
+                    # help는 위젯 ID에 포함되므로 고정 문구만 사용 (바뀌면 선택이 초기화됨)
+                    help="저장된 반기 중 선택한 기간만 불러옵니다."
+                )
+                st.caption(
+                    f"저장된 반기 {len(history_store.partitions())}개 중 "
+                    f"{', '.join(partition_label(p) for p in history_partitions)}"
+                )
+            
             # 현재 데이터 정보
-            if st.session_state.get('df') is not None:
-                df = st.session_state['df']
+            if data_index is not None:
+                df = data_index
                 
                 st.success("✅ 데이터 로드됨")
                 
@@ -1267,22 +1569,53 @@ def main():
             # 새 데이터 업로드
             st.subheader("📤 새 데이터 업로드")
             
-            uploaded_file = st.file_uploader(
-                "엑셀 파일 선택 (xlsx)",
-                type=['xlsx'],
-                help="월별 평가 데이터가 포함된 엑셀 파일을 업로드하세요"
+            uploaded_files = st.file_uploader(
+                "데이터 파일 선택 (xlsx, csv, parquet)",
+                type=['xlsx', 'csv', 'parquet'],
+                accept_multiple_files=True,
+                help="월별 평가 데이터가 포함된 엑셀, CSV(UTF-8/CP949), Parquet 파일을 업로드하세요. "
+                     "지역별 파일 여러 개나 여러 시트 엑셀은 합쳐서 계산합니다"
             )
             
-            if uploaded_file:
+            append_mode = False
+            if data_index is not None:
+                append_mode = st.checkbox(
+                    "당월 실적만 추가",
+                    help="현재 데이터에 이번 달 당월 실적만 이어서 누적 계산합니다 (전체 기간 재업로드 불필요)"
+                )
+            
+            if uploaded_files:
                 with st.spinner("📊 데이터 처리 중..."):
                     try:
-                        df_raw = load_cumulative_data(uploaded_file)
-                        is_valid, message = validate_cumulative_data(df_raw)
+                        upload_version = f"upload:{get_upload_digest(uploaded_files)}"
+                        
+                        if append_mode:
+                            # 추가 모드: 기존 데이터 버전 + 추가 파일
+                            # (이미 추가된 상태로 재실행되면 원래 기존 데이터 버전 사용)
+                            base_version = str(st.session_state.get('data_version'))
+                            suffix = f"+{upload_version}"
+                            if base_version.endswith(suffix):
+                                base_version = base_version[:-len(suffix)]
+                            base_df = df_current
+                            if base_df is None:
+                                base_df = get_saved_dataset(registry, base_version)
+                            upload_version = f"{base_version}{suffix}"
+                        else:
+                            base_version, base_df = None, None
+                        
+                        df_scored, diagnostics, is_valid, message = process_uploaded_workbook(
+                            upload_version,
+                            [(f.name, f.getvalue()) for f in uploaded_files],
+                            base_version, base_df
+                        )
+                        
+                        render_diagnostics(diagnostics)
                         
                         if is_valid:
                             st.success("✅ 데이터 검증 완료")
-                            df_scored = calculate_scores(df_raw)
-                            st.session_state['df'] = df_scored
+                            df_current = registry.put(upload_version, df_scored)
+                            data_index = df_current
+                            st.session_state['data_version'] = upload_version
                             
                             st.info(f"""
                             📊 **처리 완료**
@@ -1291,23 +1624,20 @@ def main():
                             - {df_scored['평가월'].nunique()}개월 데이터
                             """)
                             
-                            excel_data = convert_df_to_excel(df_scored)
+                            render_excel_download(
+                                df_scored,
+                                (upload_version, None),
+                                label="💾 처리된 데이터 다운로드",
+                                file_name=f"latest_data_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                                help="이 파일을 data/latest_data.xlsx로 저장 후 GitHub에 업로드하세요"
+                            )
                             
-                            if excel_data:
-                                st.download_button(
-                                    label="💾 처리된 데이터 다운로드",
-                                    data=excel_data,
-                                    file_name=f"latest_data_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    help="이 파일을 data/latest_data.xlsx로 저장 후 GitHub에 업로드하세요"
-                                )
-                                
-                                st.warning("""
-                                ⚠️ **다음 단계:**
-                                1. 위 버튼으로 파일 다운로드
-                                2. `data/latest_data.xlsx`로 저장
-                                3. GitHub에 커밋 & 푸시
-                                """)
+                            st.warning("""
+                            ⚠️ **다음 단계:**
+                            1. 위 버튼으로 파일 준비 후 다운로드
+                            2. `data/latest_data.xlsx`로 저장
+                            3. GitHub에 커밋 & 푸시
+                            """)
                         else:
                             st.error("❌ 데이터 검증 실패")
                             for msg in message:
@@ -1321,13 +1651,18 @@ def main():
             
             st.divider()
             
-            # 필터 옵션
-            if st.session_state.get('df') is not None:
-                df = st.session_state['df']
-                
+            # 필터 옵션 (선택지, 필터 결과는 데이터 버전 + 조건별 캐시, 세션에는 조건만 저장)
+            # 이력 저장소 데이터는 필터 조건을 Parquet 읽기에 넘겨 해당 행만 읽음
+            df_view = df_current
+            st.session_state['filter_key'] = None
+            data_version = st.session_state.get('data_version')
+            from_history = bool(history_partitions) and data_version == github_version
+            
+            if data_index is not None:
                 st.subheader("🔍 필터")
                 
-                months = sorted(df['평가월'].dt.to_period('M').unique())
+                months, centers, _ = get_filter_options(data_index, data_version)
+                
                 selected_months = st.multiselect(
                     "평가월 선택",
                     options=months,
@@ -1335,22 +1670,33 @@ def main():
                     format_func=lambda x: x.strftime('%Y년 %m월')
                 )
                 
-                centers = sorted(df['센터명'].unique())
+                # 주소에 ?center=센터명 (여러 개 가능)이 있으면 해당 센터만 기본 선택 (담당 센터 즐겨찾기)
+                linked_centers = [c for c in st.query_params.get_all('center') if c in centers]
+                
                 selected_centers = st.multiselect(
                     "센터 선택",
                     options=centers,
-                    default=centers
+                    default=linked_centers or centers
                 )
                 
-                if selected_months and selected_centers:
-                    df_filtered = df[
-                        (df['평가월'].dt.to_period('M').isin(selected_months)) &
-                        (df['센터명'].isin(selected_centers))
-                    ]
-                    st.session_state['df_filtered'] = df_filtered
-                    st.caption(f"필터 결과: {len(df_filtered):,}행")
-                else:
-                    st.session_state['df_filtered'] = df
+                is_full_selection = (
+                    len(selected_months) == len(months) and len(selected_centers) == len(centers)
+                )
+                
+                if selected_months and selected_centers and not is_full_selection:
+                    # 선택 순서와 무관한 키 → 같은 조건이면 세션이 달라도 캐시된 결과 재사용
+                    filter_key = (
+                        tuple(sorted(str(m) for m in selected_months)), tuple(sorted(selected_centers))
+                    )
+                    if from_history:
+                        df_view = get_history_view(data_version, tuple(history_partitions), filter_key)
+                    else:
+                        df_view = get_filtered_view(df_current, data_version, filter_key)
+                    st.session_state['filter_key'] = filter_key
+                    st.caption(f"필터 결과: {len(df_view):,}행")
+                elif from_history and df_current is None:
+                    with st.spinner("📊 데이터 로드 중..."):
+                        df_current = df_view = get_saved_dataset(registry, data_version)
             
             st.divider()
             
@@ -1382,13 +1728,16 @@ def main():
             # 캐시 초기화 버튼
             st.divider()
             if st.button("🔄 캐시 초기화", help="데이터 로딩 문제가 있을 때 사용하세요"):
+                # 분석/필터/업로드/내보내기 결과는 cache_resource에 있으므로 함께 초기화
                 st.cache_data.clear()
+                st.cache_resource.clear()
+                registry.clear()
                 st.session_state.clear()
                 st.success("✅ 캐시가 초기화되었습니다. 페이지를 새로고침하세요.")
                 st.rerun()
         
         # 메인 화면
-        if st.session_state.get('df') is None:
+        if df_view is None:
             col1, col2, col3 = st.columns([1, 2, 1])
             
             with col2:
@@ -1396,7 +1745,7 @@ def main():
                 ### 👋 환영합니다!
                 
                 **시작하기:**
-                1. 왼쪽 사이드바에서 엑셀 파일 업로드
+                1. 왼쪽 사이드바에서 데이터 파일 업로드 (xlsx, csv, parquet)
                 2. 처리된 데이터 다운로드
                 3. GitHub에 업로드하여 팀 공유
                 
@@ -1405,7 +1754,7 @@ def main():
                 `data/latest_data.xlsx` 파일이 있다면 자동으로 로드됩니다.
                 """)
         else:
-            df = st.session_state.get('df_filtered', st.session_state['df'])
+            df = df_view
             
             # ⭐⭐⭐ 사이드바 네비게이션으로 직접 페이지 전환 ⭐⭐⭐
             if selected_page == "📊 전체 현황":
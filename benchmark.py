@@ -0,0 +1,400 @@
+"""
+로딩 → 점수 계산 → 화면용 분석 → 엑셀 내보내기 단계별 성능 측정
+
+합성 데이터(센터 수 × 개월 수)를 세 가지 입력 방식(당월/누적/비율)으로 생성해
+단계별 소요 시간을 측정하고 JSON으로 저장 → 이전 결과와 비교해 성능 저하 확인
+
+사용 예:
+    python benchmark.py                              # 기본: 24x6, 500x36
+    python benchmark.py --scale 5000x120 --formats monthly
+    python benchmark.py --repeat 5 -o bench_new.json --compare bench_old.json
+    python benchmark.py --check-reader *.xlsx        # 스트리밍 리더 = pd.read_excel 확인
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics import build_analysis_context
+from data_loader import (
+    load_cumulative_data, calculate_cumulative_from_monthly, validate_cumulative_data,
+    write_excel, excel_bytes, read_excel_streaming, LoadDiagnostics, MONTHLY_KPI_MAPPING
+)
+from score_calculator import calculate_scores, get_ranking_changes, calculate_monthly_trends
+
+DEFAULT_SCALES = ['24x6', '500x36']
+PRESET_SCALES = ['24x6', '500x36', '5000x120']
+FORMATS = ['monthly', 'cumulative', 'percentage']
+STAGES = ['load', 'cumulative', 'validate', 'score', 'ranking', 'trends', 'predict', 'export']
+
+START_MONTH = '2020-01-01'
+
+# 스트리밍 리더 확인용 배치 크기 (작게 잡아 배치 경계를 많이 만듦)
+READER_CHECK_BATCH_ROWS = 7
+
+# 지표별 반기 총 오더수 범위, 반기 최종 달성률 범위
+KPI_PROFILES = {
+    '안전점검': ((400, 2000), (0.85, 1.00)),
+    '중점고객': ((50, 300), (0.85, 1.00)),
+    '사용계약': ((100, 600), (0.70, 1.00)),
+    '상담응대': ((1000, 8000), (0.95, 1.00)),
+    '상담기여': ((1000, 8000), (0.95, 1.00)),
+}
+
+
+def parse_scale(scale: str) -> tuple:
+    """'500x36' → (500, 36)"""
+    try:
+        centers, months = scale.lower().split('x')
+        return int(centers), int(months)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"규모는 '센터수x개월수' 형식이어야 합니다: {scale}")
+
+
+def generate_dataset(n_centers: int, n_months: int, data_format: str, seed: int = 0) -> pd.DataFrame:
+    """
+    합성 평가 데이터 생성
+
+    data_format: 'monthly'(당월 실적), 'cumulative'(누적 실적), 'percentage'(비율만)
+    반기마다 총 오더수를 새로 정하고 당월 실적은 반기 동안 목표 달성률까지 고르게 누적
+    """
+    rng = np.random.default_rng(seed)
+
+    months = pd.date_range(START_MONTH, periods=n_months, freq='MS')
+    centers = [f"센터{i:05d}" for i in range(1, n_centers + 1)]
+
+    center_idx = np.repeat(np.arange(n_centers), n_months)
+    month_idx = np.tile(np.arange(n_months), n_centers)
+    n_rows = len(center_idx)
+
+    # 반기 번호 (시작 월 기준), 반기 내 진행 월 1~6
+    month_numbers = months.month.to_numpy()[month_idx]
+    half_id = (months.year.to_numpy()[month_idx] - months[0].year) * 2 + (month_numbers > 6)
+    period_month = np.where(month_numbers <= 6, month_numbers, month_numbers - 6)
+    group_id = center_idx * (half_id.max() + 1) + half_id
+
+    df = pd.DataFrame({
+        '센터명': np.array(centers, dtype=object)[center_idx],
+        '평가월': months[month_idx],
+    })
+
+    for kpi_name, ((total_low, total_high), (rate_low, rate_high)) in KPI_PROFILES.items():
+        cols = MONTHLY_KPI_MAPPING[kpi_name]
+
+        # 센터-반기별 총 오더수, 최종 달성률
+        n_groups = group_id.max() + 1
+        totals = rng.integers(total_low, total_high, n_groups)[group_id]
+        final_rates = rng.uniform(rate_low, rate_high, n_groups)[group_id]
+
+        # 반기 진행에 따른 누적 실적 (월별 ±20% 변동)
+        noise = rng.uniform(0.8, 1.2, n_rows)
+        cumulative = np.minimum(np.round(totals * final_rates * period_month / 6 * noise), totals)
+
+        df[cols['total']] = totals
+        if data_format == 'monthly':
+            previous = pd.Series(cumulative).groupby(group_id).shift(1).fillna(0).to_numpy()
+            df[cols['monthly']] = np.maximum(cumulative - previous, 0)
+        elif data_format == 'cumulative':
+            df[cols['cumulative']] = cumulative
+        else:
+            df = df.drop(columns=cols['total'])
+            df[cols['rate']] = cumulative / totals
+
+    satisfaction = np.round(rng.uniform(80, 98, n_rows), 1)
+    if data_format == 'monthly':
+        df['당월만족도'] = satisfaction
+    else:
+        df['고객서비스만족도'] = satisfaction
+
+    df['민원대응적정성'] = np.where(rng.random(n_rows) < 0.02, -5, 0)
+    df['주의경고'] = np.where(rng.random(n_rows) < 0.01, -10, 0)
+    df['가점'] = np.where(rng.random(n_rows) < 0.05, 5, 0)
+
+    return df
+
+
+def _reader_check_dataset(seed: int = 0) -> pd.DataFrame:
+    """
+    스트리밍 리더 확인용 데이터 (READER_CHECK_BATCH_ROWS 기준 배치 경계에 맞춘 예외 상황 포함)
+
+    빈 센터명, 배치 하나 전체가 빈 평가월, 중간 빈 행, 끝쪽 빈 행, 빈 칸이 있는 정수/문자 컬럼
+    """
+    df = generate_dataset(4, 12, 'monthly', seed)
+    batch = READER_CHECK_BATCH_ROWS
+
+    df.loc[5, '센터명'] = None
+    df.loc[2 * batch:3 * batch - 1, '평가월'] = pd.NaT
+    df.loc[9, '가점'] = np.nan
+    df['비고'] = np.where(np.arange(len(df)) % 3 == 0, '확인', None)
+    df.loc[30] = np.nan
+    df = df.reindex(range(len(df) + 1))
+    return df
+
+
+def check_streaming_reader(paths: List[str], batch_rows: int = READER_CHECK_BATCH_ROWS,
+                           seed: int = 0, workdir: Optional[str] = None) -> List[str]:
+    """
+    read_excel_streaming(batch_rows) 결과가 pd.read_excel과 같은지 확인
+
+    paths의 엑셀 파일 + 합성 확인용 파일(_reader_check_dataset)의 첫 시트를 비교
+    센터명은 category로 읽으므로 문자열로 바꿔 비교
+    반환값: 불일치 목록 (파일: 차이 내용)
+    """
+    mismatches = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        synthetic_path = os.path.join(tmpdir, 'reader_check.xlsx')
+        _reader_check_dataset(seed).to_excel(synthetic_path, index=False, engine='openpyxl')
+
+        for path in [synthetic_path] + list(paths):
+            expected = pd.read_excel(path)
+            actual = read_excel_streaming(path, batch_rows)
+            if '센터명' in actual.columns:
+                actual['센터명'] = actual['센터명'].astype(object)
+            try:
+                pd.testing.assert_frame_equal(actual, expected)
+            except AssertionError as e:
+                mismatches.append(f"{os.path.basename(path)}: {str(e).strip().splitlines()[0]}")
+    return mismatches
+
+
+def _time_stage(func: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """
+    func를 repeat회 실행해 소요 시간 기록 (setup 시간은 제외)
+
+    반환값: {'best', 'median', 'runs'} (초), 마지막 실행 결과는 'result'
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        result = func(arg) if setup is not None else func()
+        runs.append(time.perf_counter() - start)
+
+    return {
+        'best': min(runs),
+        'median': float(np.median(runs)),
+        'runs': runs,
+        'result': result,
+    }
+
+
+def run_case(n_centers: int, n_months: int, data_format: str,
+             repeat: int = 3, workdir: Optional[str] = None, seed: int = 0) -> Dict:
+    """
+    한 가지 규모/입력 방식에 대해 전 단계 측정
+
+    반환값: {'scale', 'centers', 'months', 'format', 'rows', 'file_bytes', 'timings'}
+    timings는 단계별 {'best', 'median', 'runs'}, 해당 없는 단계(비율 입력의 누적 계산 등)는 생략
+    """
+    dataset = generate_dataset(n_centers, n_months, data_format, seed)
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        path = os.path.join(tmpdir, f"bench_{n_centers}x{n_months}_{data_format}.xlsx")
+        write_excel(dataset, path)
+        file_bytes = os.path.getsize(path)
+
+        timings = {}
+
+        def load():
+            diagnostics = LoadDiagnostics()
+            df = load_cumulative_data(path, diagnostics)
+            if df is None:
+                raise RuntimeError(diagnostics.by_level('error')[0].text)
+            return df
+
+        stage = _time_stage(load, repeat)
+        df = stage.pop('result')
+        timings['load'] = stage
+
+    if data_format == 'monthly':
+        # 로딩된 데이터에 당월 실적 컬럼이 남아 있으므로 누적 계산만 다시 수행
+        stage = _time_stage(lambda frame: calculate_cumulative_from_monthly(frame, LoadDiagnostics()),
+                            repeat, setup=df.copy)
+        stage.pop('result')
+        timings['cumulative'] = stage
+
+    stages = [
+        ('validate', lambda: validate_cumulative_data(df, LoadDiagnostics())),
+        ('score', lambda: calculate_scores(df)),
+    ]
+    for name, func in stages:
+        stage = _time_stage(func, repeat)
+        stage.pop('result')
+        timings[name] = stage
+
+    df_scored = calculate_scores(df)
+
+    stages = [
+        ('ranking', lambda: get_ranking_changes(df_scored)),
+        ('trends', lambda: calculate_monthly_trends(df_scored)),
+        ('predict', lambda: build_analysis_context(df_scored)),
+        ('export', lambda: excel_bytes(df_scored)),
+    ]
+    for name, func in stages:
+        stage = _time_stage(func, repeat)
+        stage.pop('result')
+        timings[name] = stage
+
+    return {
+        'scale': f"{n_centers}x{n_months}",
+        'centers': n_centers,
+        'months': n_months,
+        'format': data_format,
+        'rows': len(df_scored),
+        'file_bytes': file_bytes,
+        'timings': timings,
+    }
+
+
+def environment_info() -> Dict:
+    """측정 환경 (결과 비교 시 참고용)"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 1.2) -> List[str]:
+    """
+    이전 결과 대비 성능 변화 출력
+
+    같은 (규모, 입력 방식, 단계)의 best 시간을 비교해 threshold배 이상 느려진 항목 목록 반환
+    """
+    baseline_index = {
+        (case['scale'], case['format'], stage): timing['best']
+        for case in baseline.get('results', [])
+        for stage, timing in case['timings'].items()
+    }
+
+    regressions = []
+    print(f"\n📊 비교 기준: {baseline.get('created', '-')} ({baseline.get('environment', {}).get('git_commit') or '-'})")
+    for case in current['results']:
+        for stage in STAGES:
+            if stage not in case['timings']:
+                continue
+            key = (case['scale'], case['format'], stage)
+            if key not in baseline_index:
+                continue
+
+            before = baseline_index[key]
+            after = case['timings'][stage]['best']
+            ratio = after / before if before > 0 else float('inf')
+
+            mark = '  '
+            if ratio >= threshold:
+                mark = '🔴'
+                regressions.append(f"{case['scale']} {case['format']} {stage}: {before * 1000:.1f}ms → {after * 1000:.1f}ms")
+            elif ratio <= 1 / threshold:
+                mark = '🟢'
+
+            print(f"   {mark} {case['scale']:<10}{case['format']:<12}{stage:<11}"
+                  f"{before * 1000:>10.1f}ms → {after * 1000:>10.1f}ms  ({ratio:.2f}x)")
+
+    return regressions
+
+
+def _print_case(case: Dict) -> None:
+    print(f"   {case['rows']:,}행, 파일 {case['file_bytes'] / 1024:,.0f}KB")
+    for stage in STAGES:
+        if stage in case['timings']:
+            timing = case['timings'][stage]
+            print(f"   {stage:<11}{timing['best'] * 1000:>10.1f}ms (median {timing['median'] * 1000:.1f}ms)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python benchmark.py',
+        description='합성 데이터로 로딩/점수 계산/분석/내보내기 단계별 소요 시간을 측정합니다.'
+    )
+    parser.add_argument('--scale', action='append', type=parse_scale, metavar='CENTERSxMONTHS',
+                        help=f"측정 규모 (여러 번 지정 가능, 기본: {', '.join(DEFAULT_SCALES)}, "
+                             f"예시 규모: {', '.join(PRESET_SCALES)})")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=FORMATS,
+                        help='입력 방식 (기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=3, help='단계별 반복 횟수 (기본: 3, 최솟값 기록)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 난수 시드')
+    parser.add_argument('-o', '--output', help='결과 JSON 경로 (기본: benchmark_<날짜시각>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='이전 결과 JSON과 비교')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='비교 시 성능 저하로 판단할 배율 (기본: 1.2)')
+    parser.add_argument('--workdir', help='합성 엑셀 임시 저장 폴더 (기본: 시스템 임시 폴더)')
+    parser.add_argument('--check-reader', nargs='*', metavar='XLSX',
+                        help=f'성능 측정 대신 스트리밍 리더(배치 {READER_CHECK_BATCH_ROWS}행) 결과가 '
+                             f'pd.read_excel과 같은지 확인 (합성 파일 + 지정한 엑셀)')
+    args = parser.parse_args(argv)
+
+    if args.check_reader is not None:
+        mismatches = check_streaming_reader(args.check_reader, seed=args.seed, workdir=args.workdir)
+        if mismatches:
+            print(f"❌ 스트리밍 리더 불일치 {len(mismatches)}건", file=sys.stderr)
+            for mismatch in mismatches:
+                print(f"   {mismatch}", file=sys.stderr)
+            return 1
+        print(f"✅ 스트리밍 리더 = pd.read_excel ({len(args.check_reader) + 1}개 파일)")
+        return 0
+
+    scales = args.scale or [parse_scale(scale) for scale in DEFAULT_SCALES]
+    created = datetime.now()
+
+    results = []
+    for n_centers, n_months in scales:
+        for data_format in args.formats:
+            print(f"⏱️  {n_centers}x{n_months} {data_format}")
+            case = run_case(n_centers, n_months, data_format, args.repeat, args.workdir, args.seed)
+            _print_case(case)
+            results.append(case)
+
+    report = {
+        'created': created.isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results,
+    }
+
+    output_path = args.output or f"benchmark_{created.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 성능 저하 {len(regressions)}건 (기준 {args.threshold}배)", file=sys.stderr)
+            for regression in regressions:
+                print(f"   {regression}", file=sys.stderr)
+            return 1
+        print("\n✅ 성능 저하 없음")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,163 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
 import pandas as pd
-import streamlit as st
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List
 
-def load_cumulative_data(uploaded_file) -> Optional[pd.DataFrame]:
+from score_calculator import calculate_scores, compact_scores
+
+# 엑셀 파일의 컬럼형(Parquet) 캐시 저장 위치 (원본 파일 기준 상대 경로)
+CACHE_DIR_NAME = '.cache'
+
+# 입력 파일 형식 (확장자 → 형식), 확장자를 모르면 내용 앞부분으로 판별
+INPUT_FORMATS = {'.xlsx': 'xlsx', '.csv': 'csv', '.parquet': 'parquet'}
+# CSV 인코딩 시도 순서 (UTF-8은 BOM 포함 파일도 읽음, 실패 시 한글 Excel 기본 CSV)
+CSV_ENCODINGS = ['utf-8', 'cp949']
+
+# 필수 입력 컬럼
+REQUIRED_COLUMNS = ['센터명', '평가월']
+# 행 1개 = 센터 1곳의 한 달 실적 (병합/검증 시 중복 확인 키)
+UNIQUE_KEY_COLUMNS = ['센터명', '평가월']
+
+# 여러 파일/시트 병렬 읽기 프로세스 수 상한 (None이면 CPU 수)
+INGEST_MAX_WORKERS = None
+# 입력 전체 크기가 이보다 작으면 순차 읽기 (프로세스 시작 비용 1~2초가 파싱 시간보다 큼)
+PARALLEL_INGEST_BYTES = 4 * 1024 * 1024
+
+# 이 크기 이상인 엑셀은 read_excel_streaming으로 읽음 (셀 전체를 메모리에 올리지 않음)
+STREAMING_READ_BYTES = 20 * 1024 * 1024
+# 스트리밍 읽기 배치 크기 (행 수)
+STREAMING_BATCH_ROWS = 5_000
+
+# 엑셀 내보내기 (대시보드 다운로드, 명령줄 출력 공통)
+EXPORT_SHEET_NAME = '성과데이터'
+# 이 행 수 이상이면 xlsxwriter constant_memory 모드 (임시 파일에 행 단위 기록)
+CONSTANT_MEMORY_ROWS = 50_000
+# float32 점수 컬럼 내보내기 소수 자릿수 (float32 유효숫자 범위 내)
+EXPORT_FLOAT32_DECIMALS = 4
+
+# 키/기간 컬럼 형식 (센터명은 category, 반기는 고정 범주, 연도/월은 작은 정수)
+HALF_DTYPE = pd.CategoricalDtype(['상반기', '하반기'])
+PERIOD_DTYPES = {'연도': 'int16', '월': 'int8'}
+
+# 누적 계산 단위 (연도가 다르면 같은 반기라도 별도 누적), 정렬 순서
+PERIOD_GROUP_KEYS = ['센터명', '연도', '반기']
+PERIOD_SORT_KEYS = PERIOD_GROUP_KEYS + ['평가월']
+
+# 당월 실적 → 누적 실적 지표 매핑
+MONTHLY_KPI_MAPPING = {
+    '안전점검': {
+        'monthly': '당월안전점검완료',
+        'cumulative': '누적안전점검완료',
+        'total': '안전점검총오더수',
+        'rate': '안전점검실점검율'
+    },
+    '중점고객': {
+        'monthly': '당월중점고객점검완료',
+        'cumulative': '누적중점고객점검완료',
+        'total': '중점고객총오더수',
+        'rate': '중점고객안전점검율'
+    },
+    '사용계약': {
+        'monthly': '당월사용계약체결',
+        'cumulative': '누적사용계약체결',
+        'total': '사용계약총오더수',
+        'rate': '사용계약율'
+    },
+    '상담응대': {
+        'monthly': '당월상담응대완료',
+        'cumulative': '누적상담응대완료',
+        'total': '상담응대총건수',
+        'rate': '상담응대율'
+    },
+    '상담기여': {
+        'monthly': '당월상담기여완료',
+        'cumulative': '누적상담기여완료',
+        'total': '상담기여총건수',
+        'rate': '상담기여도'
+    }
+}
+
+# 검증 대상 비율 컬럼, 허용 범위
+PERCENTAGE_COLUMNS = [
+    '안전점검실점검율', '중점고객안전점검율',
+    '사용계약율', '상담응대율', '상담기여도'
+]
+PERCENTAGE_RANGE = (0, 1.1)
+EXPECTED_CENTER_COUNT = 24
+# 검증 경고를 메시지로 남기는 최대 건수 (나머지는 validation_report로 확인)
+MAX_VALIDATION_MESSAGES = 20
+# 중복 키 오류 메시지에 표시할 최대 키 수
+MAX_DUPLICATE_KEYS_SHOWN = 5
+
+VALIDATION_REPORT_COLUMNS = ['수준', '검사', '센터명', '연도', '반기', '컬럼', '행', '내용']
+
+# 고객서비스만족도 누적 평균 방식 (당월만족도 → 반기 누적)
+SATISFACTION_MODES = {
+    'mean': '단순 평균, 결측 월 제외',
+    'strict': '단순 평균, 결측 월 이후 결측',
+    'weighted': '상담응대 건수 가중 평균, 결측 월 제외',
+}
+# weighted 방식의 가중치 (당월 상담응대 완료 건수)
+SATISFACTION_WEIGHT_COLUMN = MONTHLY_KPI_MAPPING['상담응대']['monthly']
+
+
+@dataclass
+class LoadMessage:
+    """로딩/검증 메시지 1건"""
+    level: str                    # 'success' | 'info' | 'warning' | 'error'
+    text: str
+    detail: Optional[str] = None  # 상세 정보 (예: traceback)
+
+
+@dataclass
+class LoadDiagnostics:
+    """
+    데이터 로딩/검증 중 발생한 메시지 모음
+
+    처리 함수는 메시지를 기록만 하고, 화면 표시(Streamlit)나 콘솔 출력은
+    호출 측에서 처리 후 한 번에 수행 → 워커 프로세스, CLI에서도 사용 가능
+    """
+    messages: List[LoadMessage] = field(default_factory=list)
+    # validate_cumulative_data 검증 결과 (build_validation_report 형식)
+    validation_report: Optional[pd.DataFrame] = None
+
+    def add(self, level: str, text: str, detail: Optional[str] = None) -> None:
+        self.messages.append(LoadMessage(level, text, detail))
+
+    def success(self, text: str) -> None:
+        self.add('success', text)
+
+    def info(self, text: str) -> None:
+        self.add('info', text)
+
+    def warning(self, text: str) -> None:
+        self.add('warning', text)
+
+    def error(self, text: str, detail: Optional[str] = None) -> None:
+        self.add('error', text, detail)
+
+    def by_level(self, level: str) -> List[LoadMessage]:
+        return [m for m in self.messages if m.level == level]
+
+    @property
+    def has_errors(self) -> bool:
+        return any(m.level == 'error' for m in self.messages)
+
+
+def load_cumulative_data(uploaded_file,
+                         diagnostics: Optional[LoadDiagnostics] = None,
+                         satisfaction_mode: str = 'mean',
+                         max_workers: Optional[int] = INGEST_MAX_WORKERS) -> Optional[pd.DataFrame]:
     """
     누적 평가 데이터 로딩
     
@@ -10,116 +165,543 @@ def load_cumulative_data(uploaded_file) -> Optional[pd.DataFrame]:
     1. 당월 실적 입력 → 자동 누적 계산 (추천)
     2. 누적 실적 직접 입력
     3. 비율만 입력 (기존 방식)
+
+    uploaded_file: 파일 1개 또는 목록 (지역별 파일, 여러 시트 엑셀은 병합 후 한 번에 계산)
+    satisfaction_mode: 당월만족도 누적 평균 방식 (방식 1만 해당, SATISFACTION_MODES 참고)
+    max_workers: 파일/시트 병렬 읽기 프로세스 수 상한 (read_input_sources 참고)
+    진행/오류 메시지는 diagnostics에 기록 (화면 표시는 호출 측에서)
     """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+
     try:
-        df = pd.read_excel(uploaded_file, engine='openpyxl')
-        
-        # 필수 컬럼 확인
-        required_columns = ['센터명', '평가월']
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            st.error(f"❌ 필수 컬럼이 없습니다: {', '.join(missing_columns)}")
-            st.info("💡 필요한 컬럼: 센터명, 평가월, ...")
+        df = _read_input_frame(uploaded_file, diagnostics, max_workers)
+        if df is None:
             return None
         
-        # 날짜 변환
-        df['평가월'] = pd.to_datetime(df['평가월'])
-        df['연도'] = df['평가월'].dt.year
-        df['월'] = df['평가월'].dt.month
-        
-        # 반기 자동 분류
-        df['반기'] = df['월'].apply(lambda m: '상반기' if m <= 6 else '하반기')
-        
-        # 정렬 (센터명, 반기, 평가월 순)
-        df = df.sort_values(['센터명', '반기', '평가월'])
-        
         # 데이터 방식 자동 감지
         if '당월안전점검완료' in df.columns:
             # 방식 1: 당월 실적 → 누적 계산 (추천)
-            st.success("✅ 당월 실적 데이터 감지 → 자동 누적 계산 모드")
-            df = calculate_cumulative_from_monthly(df)
+            diagnostics.success("✅ 당월 실적 데이터 감지 → 자동 누적 계산 모드")
+            df = calculate_cumulative_from_monthly(df, diagnostics, satisfaction_mode)
         elif '누적안전점검완료' in df.columns:
             # 방식 2: 누적 실적 직접 입력
-            st.success("✅ 누적 실적 데이터 감지 → 직접 입력 모드")
+            diagnostics.success("✅ 누적 실적 데이터 감지 → 직접 입력 모드")
             df = process_cumulative_data(df)
         else:
             # 방식 3: 기존 방식 (비율만)
-            st.success("✅ 비율 데이터 감지 → 기존 방식 (월별 독립 평가)")
+            diagnostics.success("✅ 비율 데이터 감지 → 기존 방식 (월별 독립 평가)")
             df = process_percentage_data(df)
         
         return df
         
     except Exception as e:
-        st.error(f"❌ 파일 로딩 실패: {str(e)}")
         import traceback
-        st.error(traceback.format_exc())
+        diagnostics.error(f"❌ 파일 로딩 실패: {str(e)}", detail=traceback.format_exc())
         return None
 
 
-def calculate_cumulative_from_monthly(df: pd.DataFrame) -> pd.DataFrame:
+def _read_input_frame(uploaded_file, diagnostics: LoadDiagnostics,
+                      max_workers: Optional[int] = INGEST_MAX_WORKERS) -> Optional[pd.DataFrame]:
+    """
+    입력 파일 읽기 + 필수 컬럼 확인 + 연도/월/반기 컬럼 추가
+    """
+    df = read_input_sources(uploaded_file, diagnostics, max_workers)
+    if df is None:
+        return None
+    
+    # 필수 컬럼 확인
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        diagnostics.error(f"❌ 필수 컬럼이 없습니다: {', '.join(missing_columns)}")
+        diagnostics.info("💡 필요한 컬럼: 센터명, 평가월, ...")
+        return None
+    
+    df = add_period_columns(df)
+    
+    # 정렬 (센터명, 연도, 반기, 평가월 순)
+    return df.sort_values(PERIOD_SORT_KEYS)
+
+
+def read_input_sources(sources, diagnostics: Optional[LoadDiagnostics] = None,
+                       max_workers: Optional[int] = INGEST_MAX_WORKERS) -> Optional[pd.DataFrame]:
+    """
+    입력 파일(들)을 읽어 하나의 DataFrame으로 병합
+
+    sources: 파일 1개 또는 목록 (경로, BytesIO, Streamlit UploadedFile)
+    - 엑셀은 시트마다, CSV/Parquet은 파일마다 읽기 작업 1개
+    - 작업이 2개 이상이고 입력이 PARALLEL_INGEST_BYTES 이상이면 ProcessPoolExecutor(spawn)로 병렬 파싱
+      (업로드 파일은 임시 폴더에 한 번만 저장 후 경로 전달, 시트마다 내용을 복사하지 않음)
+    - 여러 작업 중 필수 컬럼(REQUIRED_COLUMNS)이 없는 시트/파일은 제외 (안내 시트 등)
+    - 병합 전 센터명은 문자열, 평가월은 날짜로 통일해 dtype이 섞이지 않도록 함
+
+    읽을 데이터가 없으면 diagnostics에 오류 기록 후 None
+    """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+
+    if not isinstance(sources, (list, tuple)):
+        sources = [sources]
+
+    tasks = [
+        (source, fmt, sheet, label)
+        for source in sources
+        for fmt, sheet, label in _input_tasks(source)
+    ]
+    if len(tasks) == 1:
+        source, fmt, sheet, _ = tasks[0]
+        return read_input_table(source, sheet)
+
+    workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+    total_bytes = sum(_source_size(source) or 0 for source in sources)
+    if total_bytes < PARALLEL_INGEST_BYTES:
+        workers = 1
+
+    if workers > 1:
+        frames = _parse_tasks_parallel(tasks, workers)
+    else:
+        frames = [read_input_table(source, sheet) for source, _, sheet, _ in tasks]
+
+    used = []
+    for (_, _, _, label), frame in zip(tasks, frames):
+        missing = [col for col in REQUIRED_COLUMNS if col not in frame.columns]
+        if missing:
+            diagnostics.info(f"ℹ️ {label}: 필수 컬럼({', '.join(missing)})이 없어 제외")
+        else:
+            used.append((label, frame))
+
+    if not used:
+        diagnostics.error(f"❌ 필수 컬럼({', '.join(REQUIRED_COLUMNS)})이 있는 파일/시트가 없습니다")
+        return None
+
+    parallel_text = f", 병렬 {workers}개 프로세스" if workers > 1 else ""
+    diagnostics.info(
+        f"📥 입력 {len(used)}개 병합{parallel_text}: "
+        + ", ".join(f"{label} {len(frame):,}행" for label, frame in used)
+    )
+    df = _combine_input_frames([frame for _, frame in used])
+
+    # 백업 시트, 센터가 겹치는 파일 등을 그대로 합치면 누적 합계가 두 배가 되므로 중단
+    labels = np.repeat([label for label, _ in used], [len(frame) for _, frame in used])
+    duplicates = _duplicate_key_sources(df, labels)
+    if duplicates:
+        shown = "; ".join(duplicates[:MAX_DUPLICATE_KEYS_SHOWN])
+        more = f" 외 {len(duplicates) - MAX_DUPLICATE_KEYS_SHOWN}건" if len(duplicates) > MAX_DUPLICATE_KEYS_SHOWN else ""
+        diagnostics.error(f"❌ 같은 센터/평가월 행이 여러 번 들어 있습니다 ({len(duplicates):,}건): {shown}{more}")
+        diagnostics.info("💡 중복된 시트(백업/사본)나 겹치는 파일을 빼고 다시 업로드하세요")
+        return None
+    return df
+
+
+def _duplicate_key_sources(df: pd.DataFrame, labels: np.ndarray) -> List[str]:
+    """(센터명, 평가월)이 중복된 키별 '센터명 YYYY-MM (파일/시트 이름, ...)' 목록"""
+    is_duplicate = df.duplicated(UNIQUE_KEY_COLUMNS, keep=False).to_numpy()
+    if not is_duplicate.any():
+        return []
+
+    rows = pd.DataFrame({
+        '센터명': df['센터명'].to_numpy()[is_duplicate],
+        '평가월': df['평가월'].to_numpy()[is_duplicate],
+        '출처': labels[is_duplicate],
+    })
+    sources = rows.groupby(['센터명', '평가월'], sort=True)['출처'].agg(lambda x: ", ".join(dict.fromkeys(x)))
+    return [f"{center} {_month_text(month)} ({source})" for (center, month), source in sources.items()]
+
+
+def _month_text(month) -> str:
+    return '평가월 없음' if pd.isna(month) else f"{month:%Y-%m}"
+
+
+def _input_tasks(source) -> List[tuple]:
+    """파일 1개의 읽기 작업 목록 [(형식, 시트, 표시 이름)]"""
+    label = _source_label(source)
+    fmt = detect_input_format(source)
+    if fmt != 'xlsx':
+        return [(fmt, None, label)]
+
+    sheets = _sheet_names(source)
+    if len(sheets) <= 1:
+        return [(fmt, 0, label)]
+    return [(fmt, sheet, f"{label}[{sheet}]") for sheet in sheets]
+
+
+def _source_label(source) -> str:
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', None)
+    return os.path.basename(str(name)) if name else '업로드 파일'
+
+
+def _sheet_names(source) -> List[str]:
+    """엑셀 시트 이름 (xl/workbook.xml만 읽음, 시트 내용은 읽지 않음)"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    try:
+        with zipfile.ZipFile(source) as archive:
+            root = ET.fromstring(archive.read('xl/workbook.xml'))
+    finally:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+
+    namespace = root.tag.split('}')[0] + '}' if root.tag.startswith('{') else ''
+    return [sheet.get('name') for sheet in root.iter(f'{namespace}sheet')]
+
+
+def _parse_tasks_parallel(tasks: List[tuple], workers: int) -> List[pd.DataFrame]:
+    """읽기 작업을 프로세스 풀에서 실행 (작업 순서대로 결과 반환)"""
+    with tempfile.TemporaryDirectory(prefix='ingest_') as tmp_dir:
+        paths = {}
+        for idx, (source, fmt, _, _) in enumerate(tasks):
+            if isinstance(source, (str, os.PathLike)) or id(source) in paths:
+                continue
+            path = os.path.join(tmp_dir, f"{idx}.{fmt}")
+            with open(path, 'wb') as f:
+                f.write(source.getvalue() if hasattr(source, 'getvalue') else source.read())
+            paths[id(source)] = path
+
+        sources = [paths.get(id(source), source) for source, _, _, _ in tasks]
+        sheets = [sheet for _, _, sheet, _ in tasks]
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(read_input_table, sources, sheets))
+
+
+def _combine_input_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """파일/시트별 DataFrame 병합 (컬럼 합집합, 키 컬럼 dtype 통일)"""
+    for frame in frames:
+        if isinstance(frame['센터명'].dtype, pd.CategoricalDtype):
+            frame['센터명'] = frame['센터명'].astype(object)
+        frame['평가월'] = pd.to_datetime(frame['평가월'])
+
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def detect_input_format(source) -> str:
+    """
+    입력 형식 판별 ('xlsx', 'csv', 'parquet')
+
+    파일 경로나 업로드 파일 이름의 확장자 우선, 없으면 내용 앞부분
+    (ZIP 시그니처 → xlsx, PAR1 → parquet, 그 외 csv)
+    """
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', None)
+    if name:
+        fmt = INPUT_FORMATS.get(os.path.splitext(str(name))[1].lower())
+        if fmt:
+            return fmt
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            head = f.read(4)
+    else:
+        position = source.tell()
+        head = source.read(4)
+        source.seek(position)
+
+    if head.startswith(b'PK'):
+        return 'xlsx'
+    if head == b'PAR1':
+        return 'parquet'
+    return 'csv'
+
+
+def read_input_table(source, sheet_name=0) -> pd.DataFrame:
+    """입력 파일 읽기 (xlsx, csv, parquet 자동 판별, sheet_name은 엑셀만 해당)"""
+    fmt = detect_input_format(source)
+    if fmt == 'parquet':
+        return pd.read_parquet(source)
+    if fmt == 'csv':
+        return read_csv_input(source)
+    return read_workbook(source, sheet_name)
+
+
+def read_csv_input(source) -> pd.DataFrame:
+    """
+    CSV 읽기 (pyarrow 엔진, 멀티스레드 파싱 + 컬럼 타입 추론)
+
+    CSV_ENCODINGS 순서로 시도 (UTF-8 → CP949)
+    pyarrow는 UTF-8이 아닌 값을 오류 없이 bytes 컬럼으로 읽으므로 이 경우도 다음 인코딩으로 재시도
+    """
+    last_error = None
+    for encoding in CSV_ENCODINGS:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        try:
+            df = pd.read_csv(source, engine='pyarrow', encoding=encoding)
+        except UnicodeDecodeError as e:
+            last_error = e
+            continue
+
+        if not _has_binary_columns(df):
+            return df
+        last_error = f"{encoding}로 읽을 수 없는 값이 있습니다"
+    raise ValueError(f"CSV 인코딩을 읽을 수 없습니다 ({', '.join(CSV_ENCODINGS)}): {last_error}")
+
+
+def _has_binary_columns(df: pd.DataFrame) -> bool:
+    """디코딩되지 않은 bytes 값 컬럼 여부 (pyarrow binary 컬럼은 값 전체가 bytes)"""
+    for col in df.columns[df.dtypes == object]:
+        first = df[col].first_valid_index()
+        if first is not None and isinstance(df[col].at[first], bytes):
+            return True
+    return False
+
+
+def read_workbook(source, sheet_name=0) -> pd.DataFrame:
+    """
+    엑셀 시트 1개 읽기 (sheet_name: 시트 이름 또는 순서, 기본 첫 시트)
+
+    source: 파일 경로, BytesIO, Streamlit UploadedFile
+    STREAMING_READ_BYTES 이상이면 read_excel_streaming, 그 외에는 pd.read_excel
+    """
+    size = _source_size(source)
+    if size is not None and size >= STREAMING_READ_BYTES:
+        return read_excel_streaming(source, sheet_name=sheet_name)
+    return pd.read_excel(source, sheet_name=sheet_name, engine='openpyxl')
+
+
+def _source_size(source) -> Optional[int]:
+    """입력 파일 크기 (바이트), 알 수 없으면 None"""
+    if isinstance(source, (str, os.PathLike)):
+        try:
+            return os.path.getsize(source)
+        except OSError:
+            return None
+
+    size = getattr(source, 'size', None)
+    if isinstance(size, int):
+        return size
+
+    if hasattr(source, 'getbuffer'):
+        return source.getbuffer().nbytes
+    return None
+
+
+def read_excel_streaming(source, batch_rows: int = STREAMING_BATCH_ROWS,
+                         sheet_name=0) -> pd.DataFrame:
+    """
+    엑셀 시트 1개를 행 배치 단위로 읽기 (pd.read_excel과 같은 결과)
+
+    pd.read_excel은 시트 전체 셀을 파이썬 객체 목록으로 만든 뒤 DataFrame으로 변환해
+    대용량 파일에서 최대 메모리가 결과 DataFrame의 수 배가 됨
+    openpyxl read_only 모드로 행을 순서대로 읽어 batch_rows개마다 컬럼별 배열로 변환하므로
+    최대 메모리는 결과 DataFrame + 배치 1개 수준
+
+    - 첫 행은 헤더 (빈 헤더는 'Unnamed: i', 중복 이름은 '이름.1' 형식)
+    - 중간 빈 행은 결측 행, 끝쪽 빈 행은 제외, 오류 셀(#DIV/0! 등)은 결측
+    - 센터명은 배치마다 category로 변환
+    """
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import ERROR_CODES
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        if isinstance(sheet_name, int):
+            worksheet = workbook.worksheets[sheet_name]
+        else:
+            worksheet = workbook[sheet_name]
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+
+        header = _trim_row(next(rows, ()), ERROR_CODES)
+        buffers: List[List[pd.Series]] = [[] for _ in header]
+        row_count = 0
+        batch = []
+
+        def flush():
+            nonlocal row_count
+            width = max(len(row) for row in batch)
+            # 헤더보다 값이 많은 행이 있으면 이름 없는 컬럼 추가 (앞 배치는 결측으로 채움)
+            while len(buffers) < width:
+                header.append(None)
+                buffers.append([pd.Series(np.full(row_count, np.nan))] if row_count else [])
+
+            for col_idx, buffer in enumerate(buffers):
+                values = [row[col_idx] if col_idx < len(row) else None for row in batch]
+                buffer.append(_typed_batch(values, header[col_idx] == '센터명'))
+            row_count += len(batch)
+            batch.clear()
+
+        # 중간 빈 행은 결측 행으로 유지, 마지막 값 있는 행 이후의 빈 행은 버림
+        pending_empty = 0
+        for row in rows:
+            row = _trim_row(row, ERROR_CODES)
+            if not row:
+                pending_empty += 1
+                continue
+            batch.extend([[]] * pending_empty)
+            pending_empty = 0
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                flush()
+        if batch:
+            flush()
+    finally:
+        workbook.close()
+
+    # 컬럼마다 배치를 합친 뒤 바로 해제, 블록 통합 복사 없이 DataFrame 구성
+    columns = _header_names(header)
+    data = {}
+    for name, buffer in zip(columns, buffers):
+        data[name] = _concat_batches(buffer, row_count)
+        buffer.clear()
+    return pd.DataFrame(data, copy=False)
+
+
+def _trim_row(row, error_codes) -> list:
+    """오류 셀 → None, 끝쪽 빈 셀 제거"""
+    values = [None if isinstance(v, str) and v in error_codes else v for v in row]
+    while values and (values[-1] is None or values[-1] == ''):
+        values.pop()
+    return values
+
+
+def _header_names(header: list) -> List[str]:
+    """pd.read_excel과 같은 컬럼 이름 (빈 헤더 → 'Unnamed: i', 중복 → '이름.1')"""
+    names = []
+    seen: Dict[str, int] = {}
+    for idx, value in enumerate(header):
+        name = f"Unnamed: {idx}" if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            while f"{name}.{seen[name]}" in seen:
+                seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def _typed_batch(values: list, categorical: bool) -> pd.Series:
+    """배치 1개 컬럼 값 → 타입이 정해진 Series (숫자, 날짜, 문자열 자동 판별)"""
+    series = pd.Series(values)
+    if series.isna().all():
+        # 전부 빈 셀이면 다른 배치의 타입을 따르도록 실수 결측 (센터명은 빈 category)
+        if categorical:
+            return pd.Series(pd.Categorical(values, categories=pd.Index([], dtype=object)))
+        return pd.Series(np.full(len(values), np.nan))
+    if series.dtype == object:
+        series = series.where(series.notna(), np.nan)
+        if categorical:
+            series = series.astype('category')
+    return series
+
+
+def _concat_batches(buffer: List[pd.Series], row_count: int) -> pd.Series:
+    """배치별 Series 연결 (정수로만 된 실수 컬럼은 pd.read_excel처럼 int64)"""
+    if not buffer:
+        return pd.Series(np.full(row_count, np.nan))
+
+    if all(isinstance(part.dtype, pd.CategoricalDtype) for part in buffer):
+        combined = pd.Series(pd.api.types.union_categoricals(buffer, sort_categories=True))
+    else:
+        # 전부 빈 배치(실수 결측)는 나머지 배치가 날짜면 NaT로 맞춤 (그대로 합치면 object)
+        filled_dtypes = {part.dtype for part in buffer if part.notna().any()}
+        if len(filled_dtypes) == 1:
+            dtype = filled_dtypes.pop()
+            if dtype.kind in 'mM':
+                buffer = [part if part.notna().any() else part.astype(dtype) for part in buffer]
+        combined = pd.concat(buffer, ignore_index=True)
+
+    if combined.dtype == np.float64 and len(combined):
+        values = combined.to_numpy()
+        if np.isfinite(values).all() and (values == np.round(values)).all():
+            combined = combined.astype(np.int64)
+    return combined
+
+
+def add_period_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """평가월 날짜 변환 + 연도/월/반기 컬럼 추가 (normalize_schema 형식, df를 직접 수정)"""
+    df['평가월'] = pd.to_datetime(df['평가월'])
+    df['연도'] = df['평가월'].dt.year
+    df['월'] = df['평가월'].dt.month
+    
+    # 반기 자동 분류 (1~6월 상반기, 그 외 하반기)
+    df['반기'] = pd.Categorical.from_codes(np.where(df['월'] <= 6, 0, 1), dtype=HALF_DTYPE)
+    
+    return normalize_schema(df)
+
+
+def normalize_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    세션/캐시에 오래 보관할 데이터의 컬럼 형식 통일 (있는 컬럼만 변환, df를 직접 수정)
+    
+    - 센터명: category (필터, 그룹 연산이 정수 코드로 수행됨)
+    - 반기: HALF_DTYPE
+    - 연도/월: PERIOD_DTYPES (결측이 있으면 그대로 둠)
+    - 점수 컬럼: float32 (score_calculator.compact_scores)
+    
+    그룹 연산은 observed=True로 호출해야 관측된 조합만 결과에 포함됨
+    """
+    if '센터명' in df.columns and not isinstance(df['센터명'].dtype, pd.CategoricalDtype):
+        df['센터명'] = df['센터명'].astype('category')
+    
+    if '반기' in df.columns and df['반기'].dtype != HALF_DTYPE:
+        df['반기'] = df['반기'].astype(HALF_DTYPE)
+    
+    for col, dtype in PERIOD_DTYPES.items():
+        if col in df.columns and df[col].dtype != dtype and df[col].notna().all():
+            df[col] = df[col].astype(dtype)
+    
+    return compact_scores(df)
+
+
+def calculate_cumulative_from_monthly(df: pd.DataFrame,
+                                      diagnostics: Optional[LoadDiagnostics] = None,
+                                      satisfaction_mode: str = 'mean') -> pd.DataFrame:
     """
     당월 실적을 누적 실적으로 변환
     
     핵심 로직:
-    - 반기별로 그룹화
+    - 센터별 연도-반기로 그룹화 (PERIOD_GROUP_KEYS)
     - 월별 누적 합계 계산
     - 누적 비율 = 누적 실적 / 총 오더수
+    - 고객서비스만족도 = 당월만족도 누적 평균 (satisfaction_mode: SATISFACTION_MODES 참고)
+    
+    df는 그룹 내 평가월 순으로 정렬되어 있어야 함
     """
-    # 각 지표별 매핑
-    kpi_mapping = {
-        '안전점검': {
-            'monthly': '당월안전점검완료',
-            'cumulative': '누적안전점검완료',
-            'total': '안전점검총오더수',
-            'rate': '안전점검실점검율'
-        },
-        '중점고객': {
-            'monthly': '당월중점고객점검완료',
-            'cumulative': '누적중점고객점검완료',
-            'total': '중점고객총오더수',
-            'rate': '중점고객안전점검율'
-        },
-        '사용계약': {
-            'monthly': '당월사용계약체결',
-            'cumulative': '누적사용계약체결',
-            'total': '사용계약총오더수',
-            'rate': '사용계약율'
-        },
-        '상담응대': {
-            'monthly': '당월상담응대완료',
-            'cumulative': '누적상담응대완료',
-            'total': '상담응대총건수',
-            'rate': '상담응대율'
-        },
-        '상담기여': {
-            'monthly': '당월상담기여완료',
-            'cumulative': '누적상담기여완료',
-            'total': '상담기여총건수',
-            'rate': '상담기여도'
-        }
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+    if satisfaction_mode not in SATISFACTION_MODES:
+        raise ValueError(f"지원하지 않는 만족도 누적 방식: {satisfaction_mode}")
+
+    # 센터-연도-반기 그룹 번호 (모든 누적 계산에서 공유)
+    group_ids = df.groupby(PERIOD_GROUP_KEYS, sort=False, observed=True).ngroup().to_numpy()
+    
+    kpis = {
+        kpi_name: cols for kpi_name, cols in MONTHLY_KPI_MAPPING.items()
+        if cols['monthly'] in df.columns and cols['total'] in df.columns
     }
     
-    # 각 지표별 누적 계산
-    for kpi_name, cols in kpi_mapping.items():
-        if cols['monthly'] in df.columns and cols['total'] in df.columns:
-            # 반기별로 그룹화하여 누적 합계
-            df[cols['cumulative']] = df.groupby(['센터명', '반기'])[cols['monthly']].cumsum()
-            
-            # 누적 비율 계산
-            df[cols['rate']] = (df[cols['cumulative']] / df[cols['total']]).fillna(0)
-            
-            # 0~1 범위로 제한
-            df[cols['rate']] = df[cols['rate']].clip(0, 1)
-            
-            st.info(f"📊 {kpi_name} 누적 계산 완료")
+    if kpis:
+        monthly_cols = [cols['monthly'] for cols in kpis.values()]
+        total_cols = [cols['total'] for cols in kpis.values()]
+        
+        # 전 지표 반기 누적 합계를 한 번의 그룹 연산으로 계산
+        cumulative = df[monthly_cols].groupby(group_ids, sort=False).cumsum()
+        
+        # 누적 비율 = 누적 실적 / 총 오더수 (0으로 나누면 0 또는 1), 0~1 범위로 제한
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = cumulative.to_numpy(dtype='float64') / df[total_cols].to_numpy(dtype='float64')
+        rates = np.clip(np.nan_to_num(rates, nan=0.0, posinf=1.0, neginf=0.0), 0, 1)
+        
+        for i, cols in enumerate(kpis.values()):
+            df[cols['cumulative']] = cumulative[cols['monthly']].to_numpy()
+            df[cols['rate']] = rates[:, i]
+        
+        diagnostics.info(f"📊 누적 계산 완료: {', '.join(kpis)}")
     
     # 고객서비스만족도는 누적 평균
     if '당월만족도' in df.columns:
-        df['고객서비스만족도'] = df.groupby(['센터명', '반기'])['당월만족도'].transform(
-            lambda x: x.expanding().mean()
-        )
-        st.info("📊 고객서비스만족도 누적 평균 계산 완료")
+        if satisfaction_mode == 'weighted' and SATISFACTION_WEIGHT_COLUMN not in df.columns:
+            diagnostics.warning(
+                f"⚠️ {SATISFACTION_WEIGHT_COLUMN} 컬럼이 없어 만족도를 단순 평균으로 누적합니다"
+            )
+            satisfaction_mode = 'mean'
+        
+        df['고객서비스만족도'] = _cumulative_mean(df, '당월만족도', group_ids, satisfaction_mode)
+        diagnostics.info(f"📊 고객서비스만족도 누적 평균 계산 완료 ({SATISFACTION_MODES[satisfaction_mode]})")
     elif '고객서비스만족도' in df.columns:
         # 이미 만족도가 있으면 그대로 사용
         df['고객서비스만족도'] = pd.to_numeric(df['고객서비스만족도'], errors='coerce')
@@ -135,6 +717,45 @@ def calculate_cumulative_from_monthly(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _cumulative_mean(df: pd.DataFrame, value_col: str, group_ids: np.ndarray,
+                     mode: str = 'mean') -> pd.Series:
+    """
+    그룹별 누적 평균 (그룹별 누적 합계 / 누적 건수, 파이썬 반복 없음)
+    
+    group_ids: 행별 그룹 번호 (ngroup 결과)
+    
+    - mean: 결측 월은 건너뜀 (expanding().mean()과 같음)
+    - strict: 결측 월이 나오면 그 이후 결측
+    - weighted: SATISFACTION_WEIGHT_COLUMN 가중 평균, 가중치 합이 0이면 단순 평균
+    """
+    values = pd.to_numeric(df[value_col], errors='coerce')
+    present = values.notna()
+    
+    if mode == 'strict':
+        grouped = values.groupby(group_ids, sort=False)
+        means = grouped.cumsum() / (grouped.cumcount() + 1)
+        missing_seen = (~present).groupby(group_ids, sort=False).cumsum() > 0
+        return means.mask(missing_seen)
+    
+    filled = values.fillna(0)
+    counts = present.astype('float64')
+    block = {'합계': filled, '건수': counts}
+    
+    if mode == 'weighted':
+        weights = pd.to_numeric(df[SATISFACTION_WEIGHT_COLUMN], errors='coerce').fillna(0).clip(lower=0)
+        weights = weights.where(present, 0)
+        block.update({'가중합계': filled * weights, '가중치': weights})
+    
+    sums = pd.DataFrame(block).groupby(group_ids, sort=False).cumsum()
+    means = sums['합계'] / sums['건수'].where(sums['건수'] > 0)
+    
+    if mode == 'weighted':
+        weighted = sums['가중합계'] / sums['가중치'].where(sums['가중치'] > 0)
+        means = weighted.fillna(means)
+    
+    return means
+
+
 def process_cumulative_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     누적 실적이 직접 입력된 경우 처리
@@ -198,47 +819,232 @@ def process_percentage_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def validate_cumulative_data(df: pd.DataFrame) -> tuple[bool, List[str]]:
+def append_monthly_data(history: pd.DataFrame, new_rows: pd.DataFrame,
+                        diagnostics: Optional[LoadDiagnostics] = None,
+                        satisfaction_mode: str = 'mean') -> Optional[pd.DataFrame]:
     """
-    누적 데이터 검증
+    당월 실적만 기존 (점수 계산된) 데이터에 추가
+    
+    - 새 월과 같은 반기의 이전 월 당월 실적만 가져와 누적 계산
+      (반기 내 최대 5개월 → 기존 데이터가 늘어나도 처리량 일정)
+    - 새 행만 점수 계산 후 기존 데이터에 추가
+    - 기존 데이터에 같은 (센터명, 평가월)이 있으면 새 데이터로 교체
+    
+    new_rows는 _read_input_frame으로 읽은 당월 실적 원본
+    satisfaction_mode는 기존 데이터를 만들 때와 같은 방식을 사용해야 함
+    """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+    
+    if MONTHLY_KPI_MAPPING['안전점검']['monthly'] not in new_rows.columns:
+        diagnostics.error("❌ 추가 모드는 당월 실적 데이터만 지원합니다 (당월안전점검완료 컬럼 필요)")
+        return None
+    
+    input_columns = [col for col in new_rows.columns if col not in ('연도', '월', '반기')]
+    missing_columns = [col for col in input_columns if col not in history.columns]
+    if missing_columns:
+        diagnostics.error(
+            f"❌ 기존 데이터에 당월 실적 컬럼이 없어 추가할 수 없습니다: {', '.join(missing_columns)}"
+        )
+        diagnostics.info("💡 전체 기간 파일을 업로드하세요.")
+        return None
+    
+    # 센터명 범주를 맞춰야 키 비교, concat 결과가 category로 유지됨
+    center_dtype = _union_center_dtype(history, new_rows)
+    history = history.astype({'센터명': center_dtype})
+    new_rows = new_rows.astype({'센터명': center_dtype})
+    
+    # 새 월보다 뒤의 데이터가 이미 있으면 누적이 어긋나므로 중단
+    last_new_month = new_rows.groupby('센터명', observed=True)['평가월'].max()
+    later = history['평가월'] > history['센터명'].map(last_new_month)
+    if later.any():
+        centers = sorted(map(str, history.loc[later, '센터명'].unique()))
+        shown = ', '.join(centers[:5]) + (f" 외 {len(centers) - 5}개" if len(centers) > 5 else "")
+        diagnostics.error(f"❌ 추가할 월 이후 데이터가 이미 있습니다: {shown}")
+        return None
+    
+    new_keys = pd.MultiIndex.from_frame(new_rows[['센터명', '평가월']])
+    replaced = pd.MultiIndex.from_frame(history[['센터명', '평가월']]).isin(new_keys)
+    
+    # 같은 반기의 이전 월 당월 실적 (누적 기준)
+    first_new_month = new_rows['평가월'].min()
+    half_start = pd.Timestamp(first_new_month.year, 1 if first_new_month.month <= 6 else 7, 1)
+    context_mask = (
+        ~replaced &
+        (history['평가월'] >= half_start) &
+        history['센터명'].isin(new_rows['센터명'].unique())
+    )
+    context = add_period_columns(history.loc[context_mask, input_columns].copy())
+    context = context.merge(new_rows[PERIOD_GROUP_KEYS].drop_duplicates(), on=PERIOD_GROUP_KEYS)
+    
+    combined = pd.concat([context, new_rows], ignore_index=True)
+    combined = combined.sort_values(PERIOD_SORT_KEYS)
+    combined = calculate_cumulative_from_monthly(combined, diagnostics, satisfaction_mode)
+    
+    is_new = pd.MultiIndex.from_frame(combined[['센터명', '평가월']]).isin(new_keys)
+    scored_new = calculate_scores(combined[is_new])
+    
+    diagnostics.success(
+        f"✅ 당월 실적 추가: {scored_new['센터명'].nunique()}개 센터 × "
+        f"{scored_new['평가월'].nunique()}개월"
+        + (f" (기존 {int(replaced.sum())}행 교체)" if replaced.any() else "")
+    )
+    
+    result = pd.concat([history[~replaced], scored_new], ignore_index=True)
+    return normalize_schema(result.sort_values(PERIOD_SORT_KEYS).reset_index(drop=True))
+
+
+def _union_center_dtype(*frames: pd.DataFrame) -> pd.CategoricalDtype:
+    """여러 데이터의 센터명을 모두 포함하는 category 형식"""
+    categories = pd.Index([], dtype=object)
+    for frame in frames:
+        centers = frame['센터명']
+        if isinstance(centers.dtype, pd.CategoricalDtype):
+            values = centers.cat.categories
+        else:
+            values = pd.Index(centers.dropna().unique())
+        categories = categories.union(values)
+    return pd.CategoricalDtype(categories)
+
+
+def load_monthly_increment(uploaded_file, history: pd.DataFrame,
+                           diagnostics: Optional[LoadDiagnostics] = None,
+                           satisfaction_mode: str = 'mean',
+                           max_workers: Optional[int] = INGEST_MAX_WORKERS) -> Optional[pd.DataFrame]:
+    """
+    당월 실적 파일(들)을 읽어 기존 데이터에 추가 (append_monthly_data 참고)
+    """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+
+    try:
+        new_rows = _read_input_frame(uploaded_file, diagnostics, max_workers)
+        if new_rows is None:
+            return None
+        
+        return append_monthly_data(history, new_rows, diagnostics, satisfaction_mode)
+        
+    except Exception as e:
+        import traceback
+        diagnostics.error(f"❌ 파일 로딩 실패: {str(e)}", detail=traceback.format_exc())
+        return None
+
+
+def build_validation_report(df: pd.DataFrame) -> pd.DataFrame:
     """
-    errors = []
-    warnings = []
+    누적 데이터 검증 위반 목록 (위반 1건당 1행)
+    
+    컬럼: VALIDATION_REPORT_COLUMNS
+          수준('error' | 'warning'), 검사('센터수' | '중복' | '월순서' | '비율범위'),
+          센터명, 연도, 반기, 컬럼, 행, 내용(표시용 메시지)
+    
+    행: 위반 행의 df 인덱스 레이블 목록 (엑셀 행 번호가 아님)
+        load_cumulative_data 결과는 읽은 순서대로 0부터 매긴 번호 (여러 파일/시트면 병합 후 번호)
+        → 파일 1개, 시트 1개면 엑셀 행 번호 = 레이블 + 2 (머리글 1행)
+    
+    월순서: (센터명, 연도, 반기)별 월의 최솟값/최댓값/개수를 한 번의 그룹 집계로 구해
+            반기 첫 달부터 빠짐없이 이어지는지 확인 (중복 월은 한 번으로 셈)
+    """
+    issues = []
     
     # 센터 수 확인
     center_count = df['센터명'].nunique()
-    if center_count != 24:
-        warnings.append(f"⚠️ 센터 수가 24개가 아닙니다 (현재: {center_count}개)")
+    if center_count != EXPECTED_CENTER_COUNT:
+        issues.append({
+            '수준': 'warning', '검사': '센터수', '센터명': None, '연도': None, '반기': None, '컬럼': '센터명', '행': [],
+            '내용': f"⚠️ 센터 수가 {EXPECTED_CENTER_COUNT}개가 아닙니다 (현재: {center_count}개)",
+        })
     
-    # 반기별 데이터 확인
-    for center in df['센터명'].unique():
-        center_data = df[df['센터명'] == center]
+    # (센터명, 평가월) 중복 확인 - 같은 달 행이 여러 개면 누적 합계가 부풀려짐
+    is_duplicate = df.duplicated(UNIQUE_KEY_COLUMNS, keep=False)
+    if is_duplicate.any():
+        duplicated = df.loc[is_duplicate, UNIQUE_KEY_COLUMNS].drop_duplicates()
+        examples = ", ".join(
+            f"{center} {_month_text(month)}"
+            for center, month in duplicated.head(MAX_DUPLICATE_KEYS_SHOWN).itertuples(index=False)
+        )
+        more = f" 외 {len(duplicated) - MAX_DUPLICATE_KEYS_SHOWN}건" if len(duplicated) > MAX_DUPLICATE_KEYS_SHOWN else ""
+        issues.append({
+            '수준': 'error', '검사': '중복', '센터명': None, '연도': None, '반기': None, '컬럼': '평가월',
+            '행': df.index[is_duplicate.to_numpy()].tolist(),
+            '내용': f"❌ 센터명/평가월이 같은 행이 있습니다 ({len(duplicated):,}건): {examples}{more}",
+        })
+    
+    # 반기별 월 순서 확인
+    periods = df[df['반기'].isin(['상반기', '하반기'])]
+    if len(periods) > 0:
+        group_ids = periods.groupby(PERIOD_GROUP_KEYS, sort=False, observed=True).ngroup().to_numpy()
+        months = periods['월'].to_numpy()
+        
+        stats = pd.DataFrame({'월': months}).groupby(group_ids)['월'].agg(['min', 'max', 'nunique'])
+        keys = periods[PERIOD_GROUP_KEYS].groupby(group_ids).first()
+        half_start = np.where(keys['반기'] == '상반기', 1, 7)
+        
+        contiguous = (stats['min'] == half_start) & (stats['max'] - stats['min'] + 1 == stats['nunique'])
+        bad_ids = stats.index[~contiguous.to_numpy()]
         
-        for period in ['상반기', '하반기']:
-            period_data = center_data[center_data['반기'] == period]
+        if len(bad_ids) > 0:
+            is_bad = np.isin(group_ids, bad_ids)
+            bad_rows = pd.DataFrame({'행': periods.index[is_bad], '월': months[is_bad]})
+            grouped = bad_rows.groupby(group_ids[is_bad])
+            rows = grouped['행'].agg(list)
+            month_lists = grouped['월'].agg(lambda x: sorted(set(x.tolist())))
             
-            if len(period_data) > 0:
-                # 월이 순차적인지 확인
-                months = sorted(period_data['월'].unique())
-                expected_months = list(range(1, 7)) if period == '상반기' else list(range(7, 13))
-                
-                if months != expected_months[:len(months)]:
-                    warnings.append(f"⚠️ {center} {period} 데이터가 순차적이지 않습니다: {months}")
+            # 원래 순서: 센터 등장 순 → 연도 → 상반기, 하반기
+            center_order = pd.Index(pd.unique(df['센터명']))
+            bad_keys = keys.loc[bad_ids].assign(
+                _center=lambda k: center_order.get_indexer(k['센터명']),
+                _half=lambda k: (k['반기'] == '하반기').astype(int),
+            ).sort_values(['_center', '연도', '_half'])
+            
+            # 여러 연도 데이터만 메시지에 연도 표시
+            multi_year = keys['연도'].nunique() > 1
+            for group_id, key in bad_keys.iterrows():
+                period = f"{key['연도']}년 {key['반기']}" if multi_year else key['반기']
+                issues.append({
+                    '수준': 'warning', '검사': '월순서', '센터명': key['센터명'],
+                    '연도': key['연도'], '반기': key['반기'],
+                    '컬럼': '월', '행': rows[group_id],
+                    '내용': f"⚠️ {key['센터명']} {period} 데이터가 순차적이지 않습니다: {month_lists[group_id]}",
+                })
     
     # 비율 범위 확인
-    percentage_cols = [
-        '안전점검실점검율', '중점고객안전점검율', 
-        '사용계약율', '상담응대율', '상담기여도'
-    ]
-    
-    for col in percentage_cols:
+    low, high = PERCENTAGE_RANGE
+    for col in PERCENTAGE_COLUMNS:
         if col in df.columns:
-            if (df[col] < 0).any() or (df[col] > 1.1).any():
-                errors.append(f"❌ {col}이 정상 범위(0~1)를 벗어났습니다")
+            out_of_range = (df[col] < low) | (df[col] > high)
+            if out_of_range.any():
+                issues.append({
+                    '수준': 'error', '검사': '비율범위', '센터명': None, '연도': None, '반기': None, '컬럼': col,
+                    '행': df.index[out_of_range.to_numpy()].tolist(),
+                    '내용': f"❌ {col}이 정상 범위(0~1)를 벗어났습니다",
+                })
     
-    # 경고 메시지 표시
-    for warning in warnings:
-        st.warning(warning)
+    return pd.DataFrame(issues, columns=VALIDATION_REPORT_COLUMNS)
+
+
+def validate_cumulative_data(df: pd.DataFrame,
+                             diagnostics: Optional[LoadDiagnostics] = None) -> tuple[bool, List[str]]:
+    """
+    누적 데이터 검증
+
+    오류 목록은 반환값으로, 경고는 diagnostics에 기록 (최대 MAX_VALIDATION_MESSAGES건)
+    위반 행 목록을 포함한 전체 결과는 diagnostics.validation_report
+    """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+
+    report = build_validation_report(df)
+    diagnostics.validation_report = report
+    
+    errors = report.loc[report['수준'] == 'error', '내용'].tolist()
+    warnings = report.loc[report['수준'] == 'warning', '내용'].tolist()
+    
+    # 경고 메시지 기록
+    for warning in warnings[:MAX_VALIDATION_MESSAGES]:
+        diagnostics.warning(warning)
+    if len(warnings) > MAX_VALIDATION_MESSAGES:
+        diagnostics.warning(f"⚠️ 외 {len(warnings) - MAX_VALIDATION_MESSAGES}건 (검증 상세 참고)")
     
     return (len(errors) == 0, errors)
 
@@ -258,3 +1064,127 @@ def get_data_summary(df: pd.DataFrame) -> Dict:
         'has_first_half': '상반기' in df['반기'].values,
         'has_second_half': '하반기' in df['반기'].values,
     }
+
+
+def _read_cache_meta(meta_path: str) -> Optional[Dict]:
+    """캐시 메타데이터(크기, 수정시각, 해시) 읽기"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache_meta(meta_path: str, meta: Dict) -> None:
+    """캐시 메타데이터 기록 (임시 파일 → 교체)"""
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _write_cache(df: pd.DataFrame, cache_path: str, meta_path: str, meta: Dict) -> None:
+    """Parquet 캐시와 메타데이터 기록 (실패해도 원본 로딩에는 영향 없음)"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        _write_cache_meta(meta_path, meta)
+    except Exception:
+        # pyarrow 미설치, 읽기 전용 파일시스템, 변환 불가 타입 등
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_excel_cached(path: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    엑셀 파일 읽기 (Parquet 캐시 사용)
+
+    캐시 유효성 판단:
+    1. 파일 크기 + 수정시각이 같으면 캐시 사용
+    2. 수정시각만 바뀌었으면 (재배포, git checkout 등) 내용 해시 비교 후 캐시 사용
+    3. 그 외에는 엑셀을 다시 읽고 캐시 갱신
+
+    예: data/latest_data.xlsx → data/.cache/latest_data.parquet
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}.parquet")
+    meta_path = os.path.join(cache_dir, f"{stem}.meta.json")
+
+    stat = os.stat(path)
+    meta = _read_cache_meta(meta_path)
+    cache_ready = meta is not None and os.path.exists(cache_path)
+
+    if cache_ready and meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns:
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception:
+            cache_ready = False
+
+    with open(path, 'rb') as f:
+        content = f.read()
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    new_meta = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+
+    if cache_ready and meta.get('sha256') == sha256:
+        try:
+            df = pd.read_parquet(cache_path)
+        except Exception:
+            df = None
+
+        if df is not None:
+            try:
+                _write_cache_meta(meta_path, new_meta)
+            except OSError:
+                pass
+            return df
+
+    df = read_workbook(BytesIO(content))
+    _write_cache(df, cache_path, meta_path, new_meta)
+    return df
+
+
+def write_excel(df: pd.DataFrame, target, sheet_name: str = EXPORT_SHEET_NAME) -> None:
+    """
+    DataFrame을 xlsx로 저장 (xlsxwriter)
+
+    target: 파일 경로 또는 BytesIO
+    pandas to_excel(셀 단위 객체 생성)보다 빠르도록 열을 파이썬 값 목록으로 바꾼 뒤 행 단위로 기록
+    CONSTANT_MEMORY_ROWS 이상이면 constant_memory 모드로 메모리 사용량을 일정하게 유지
+    float32 컬럼은 EXPORT_FLOAT32_DECIMALS 자리로 반올림 (482.3999938… → 482.4)
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(target, {
+        'constant_memory': len(df) >= CONSTANT_MEMORY_ROWS,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'nan_inf_to_errors': True,
+    })
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+
+        # 결측값(NaN, NaT)은 빈 셀, 값은 파이썬 기본 타입으로 변환
+        columns = []
+        for col in df.columns:
+            values = df[col]
+            if values.dtype == np.float32:
+                values = values.astype(np.float64).round(EXPORT_FLOAT32_DECIMALS)
+            columns.append(values.astype(object).where(values.notna(), None).tolist())
+        for row_idx, values in enumerate(zip(*columns), start=1):
+            worksheet.write_row(row_idx, 0, values)
+    finally:
+        workbook.close()
+
+
+def excel_bytes(df: pd.DataFrame, sheet_name: str = EXPORT_SHEET_NAME) -> bytes:
+    """DataFrame → xlsx 바이트 (다운로드용)"""
+    output = BytesIO()
+    write_excel(df, output, sheet_name)
+    return output.getvalue()
@@ -0,0 +1,62 @@
+"""
+프로세스 전역 데이터셋 저장소
+
+Streamlit 세션마다 같은 DataFrame을 복사해 두지 않도록 데이터 버전별로 한 벌만 보관
+세션에는 데이터 버전과 필터 조건만 저장하고, 화면에서는 이 저장소의 DataFrame을 읽기만 함
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+
+class DatasetRegistry:
+    """
+    데이터 버전 → 점수 계산된 DataFrame (모든 세션이 같은 객체를 공유)
+
+    - 최근 사용 순으로 max_entries개까지 보관 (LRU)
+    - 여러 세션 스레드에서 동시에 호출해도 안전
+    - 반환된 DataFrame은 수정하지 말 것 (필요하면 copy 후 사용)
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._datasets: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: Optional[str]) -> Optional[pd.DataFrame]:
+        """버전에 해당하는 데이터 (없거나 만료되었으면 None)"""
+        if version is None:
+            return None
+
+        with self._lock:
+            df = self._datasets.get(version)
+            if df is not None:
+                self._datasets.move_to_end(version)
+            return df
+
+    def put(self, version: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        데이터 등록 후 공유 객체 반환
+
+        같은 버전이 이미 있으면 먼저 등록된 객체를 그대로 반환 (동시 로딩 시 한 벌만 유지)
+        """
+        with self._lock:
+            existing = self._datasets.get(version)
+            if existing is not None:
+                self._datasets.move_to_end(version)
+                return existing
+
+            self._datasets[version] = df
+            while len(self._datasets) > self.max_entries:
+                self._datasets.popitem(last=False)
+            return df
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datasets.clear()
+
+    def __len__(self) -> int:
+        return len(self._datasets)
@@ -0,0 +1,276 @@
+"""
+연도/반기별 분할 이력 저장소 (Parquet)
+
+점수 계산된 데이터를 반기마다 파일 1개로 저장
+    data/history/year=2025/half=2/part-0.parquet
+
+반기 누적은 (센터명, 연도, 반기) 안에서만 이어지므로 반기 파일끼리는 서로 독립
+화면에서는 필요한 반기 파일만 읽고, 당월 추가도 현재 반기 파일만 다시 씀
+
+반기 파일은 센터명, 평가월 순으로 정렬해 ROW_GROUP_ROWS 행마다 row group으로 나눠 저장
+→ 센터/평가월 필터를 읽기 단계로 넘기면(read의 months, centers) row group 통계로
+  해당 없는 구간은 읽지 않고, 조건에 맞는 행만 DataFrame으로 만듦
+
+사용 예:
+    python -m history_store import data/latest_data.xlsx
+    python -m history_store list
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from data_loader import (
+    HALF_DTYPE, PERIOD_SORT_KEYS, REQUIRED_COLUMNS, read_excel_cached, normalize_schema, add_period_columns
+)
+from score_calculator import calculate_scores, KPI_SPECS
+
+DEFAULT_HISTORY_ROOT = 'data/history'
+PARTITION_FILE = 'part-0.parquet'
+# 반기 파일 row group 크기 (작을수록 센터 필터로 건너뛰는 구간이 늘어남)
+ROW_GROUP_ROWS = 4_096
+# 사이드바 필터 선택지/요약에 필요한 컬럼 (index에서 이 컬럼만 읽음)
+INDEX_COLUMNS = ['센터명', '평가월']
+
+# (연도, 반기 번호) - 반기 번호 1 = 상반기, 2 = 하반기
+Partition = Tuple[int, int]
+
+_PARTITION_DIR = re.compile(r'^year=(\d{4})$')
+_HALF_DIR = re.compile(r'^half=([12])$')
+
+
+def partition_of(year: int, half: str) -> Partition:
+    """(연도, '상반기'/'하반기') → (연도, 반기 번호)"""
+    return int(year), HALF_DTYPE.categories.get_loc(half) + 1
+
+
+def partition_label(partition: Partition) -> str:
+    year, half = partition
+    return f"{year}년 {HALF_DTYPE.categories[half - 1]}"
+
+
+def partitions_for_months(months) -> List[Partition]:
+    """평가월 목록이 속한 반기 (오래된 순)"""
+    return sorted({(month.year, 1 if month.month <= 6 else 2) for month in months})
+
+
+def _month_runs(periods: List[pd.Period]) -> List[Tuple[pd.Period, pd.Period]]:
+    """정렬된 월 목록 → 연속 구간 [(시작 월, 끝 월)]"""
+    runs = []
+    for period in periods:
+        if runs and period == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], period)
+        else:
+            runs.append((period, period))
+    return runs
+
+
+class HistoryStore:
+    """
+    root 아래 year=YYYY/half=N/PARTITION_FILE 형식 저장소
+
+    - write: 데이터에 포함된 반기 파일만 교체 (임시 파일 → os.replace)
+    - read: 지정한 반기 파일만 읽어 병합 (기본: 전체), 평가월/센터 조건은 Parquet 읽기에 적용
+    - index: 센터명, 평가월 컬럼만 읽은 목록 (필터 선택지, 데이터 요약용)
+    - version: 반기 파일 크기 + 수정시각 기반 버전 (캐시 키)
+    """
+
+    def __init__(self, root: str = DEFAULT_HISTORY_ROOT):
+        self.root = root
+
+    def partition_path(self, partition: Partition) -> str:
+        year, half = partition
+        return os.path.join(self.root, f"year={year}", f"half={half}", PARTITION_FILE)
+
+    def partitions(self) -> List[Partition]:
+        """저장된 반기 목록 (오래된 순)"""
+        if not os.path.isdir(self.root):
+            return []
+
+        found = []
+        for year_dir in os.listdir(self.root):
+            year_match = _PARTITION_DIR.match(year_dir)
+            if not year_match:
+                continue
+            for half_dir in os.listdir(os.path.join(self.root, year_dir)):
+                half_match = _HALF_DIR.match(half_dir)
+                partition = (int(year_match.group(1)), int(half_match.group(1))) if half_match else None
+                if partition and os.path.exists(self.partition_path(partition)):
+                    found.append(partition)
+        return sorted(found)
+
+    def latest(self, count: Optional[int] = 1) -> List[Partition]:
+        """최근 count개 반기 (None이면 전체)"""
+        partitions = self.partitions()
+        return partitions if count is None else partitions[-count:]
+
+    def version(self, partitions: Optional[List[Partition]] = None) -> str:
+        """지정한 반기 파일들의 버전 (파일이 바뀌면 달라짐)"""
+        if partitions is None:
+            partitions = self.partitions()
+
+        digest = hashlib.sha256()
+        for partition in partitions:
+            stat = os.stat(self.partition_path(partition))
+            digest.update(f"{partition}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()[:16]
+
+    def read(self, partitions: Optional[List[Partition]] = None,
+             months: Optional[List[pd.Timestamp]] = None,
+             centers: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        지정한 반기 데이터 병합 (지정한 반기가 하나도 저장되어 있지 않으면 None)
+
+        months: 평가월 목록 (Timestamp/Period/'YYYY-MM') - 해당 반기 파일만 열고,
+                파일 안에서는 연속된 월 구간별 범위 조건으로 해당 월 행만 읽음
+        centers: 센터명 목록 - row group 통계로 건너뛴 뒤 해당 센터 행만 읽음
+        months/centers가 빈 목록이거나 조건에 맞는 행이 없으면 저장된 컬럼 형식의 빈 DataFrame
+        정렬은 data_loader와 같은 PERIOD_SORT_KEYS 순
+        """
+        if partitions is None:
+            partitions = self.partitions()
+        if not partitions:
+            return None
+        stored = partitions
+
+        # 조건은 OR(구간) of AND 형식 (pyarrow filters DNF)
+        conjunctions = [[]]
+        if months is not None:
+            periods = sorted({pd.Period(month, freq='M') for month in months})
+            wanted = set(partitions_for_months(periods))
+            partitions = [partition for partition in partitions if partition in wanted]
+            conjunctions = [
+                [('평가월', '>=', start.to_timestamp()), ('평가월', '<', (end + 1).to_timestamp())]
+                for start, end in _month_runs(periods)
+            ]
+        if centers is not None:
+            for conjunction in conjunctions:
+                conjunction.append(('센터명', 'in', list(centers)))
+
+        # 빈 선택 (pyarrow는 빈 'in' 목록을 처리하지 못함) → 파일 스키마만 읽은 빈 DataFrame
+        if not partitions or not conjunctions or (centers is not None and len(centers) == 0):
+            frames = [pq.read_schema(self.partition_path(stored[0])).empty_table().to_pandas()]
+        else:
+            filters = [conjunction for conjunction in conjunctions if conjunction] or None
+            frames = [
+                pd.read_parquet(self.partition_path(partition), filters=filters)
+                for partition in partitions
+            ]
+        for frame in frames:
+            if isinstance(frame['센터명'].dtype, pd.CategoricalDtype):
+                frame['센터명'] = frame['센터명'].astype(object)
+
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df = normalize_schema(df)
+        return df.sort_values(PERIOD_SORT_KEYS, kind='stable').reset_index(drop=True)
+
+    def index(self, partitions: Optional[List[Partition]] = None) -> Optional[pd.DataFrame]:
+        """지정한 반기의 INDEX_COLUMNS만 읽은 목록 (없으면 None)"""
+        if partitions is None:
+            partitions = self.partitions()
+        if not partitions:
+            return None
+
+        frames = [
+            pd.read_parquet(self.partition_path(partition), columns=INDEX_COLUMNS)
+            for partition in partitions
+        ]
+        for frame in frames:
+            frame['센터명'] = frame['센터명'].astype(object)
+        return normalize_schema(pd.concat(frames, ignore_index=True))
+
+    def write(self, df: pd.DataFrame) -> List[Partition]:
+        """
+        점수 계산된 데이터를 반기별로 저장 (df에 있는 반기 파일만 교체)
+
+        반환값: 저장한 반기 목록
+        """
+        missing = [col for col in ('연도', '반기') if col not in df.columns]
+        if missing:
+            raise ValueError(f"반기 분할에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+
+        written = []
+        for (year, half), part in df.groupby(['연도', '반기'], observed=True, sort=True):
+            partition = partition_of(year, half)
+            path = self.partition_path(partition)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # 센터명 순 정렬 → row group별 센터 범위가 좁아져 필터로 건너뛸 수 있음
+            part = part.sort_values(['센터명', '평가월'], kind='stable').reset_index(drop=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                part.to_parquet(tmp_path, index=False, row_group_size=ROW_GROUP_ROWS)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            written.append(partition)
+        return written
+
+
+def prepare_for_store(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    대시보드 데이터 → 저장 형식 (연도/월/반기 컬럼 추가, 점수가 없으면 계산)
+
+    필수 컬럼이 없거나 평가월을 날짜로 바꿀 수 없으면 ValueError
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    df = add_period_columns(df)
+
+    # 점수 계산 전 원본(비율만 있는 파일)이면 대시보드와 같이 점수 계산
+    score_columns = [f"{spec['name']}_점수" for spec in KPI_SPECS] + ['목표달성여부']
+    if any(col not in df.columns for col in score_columns):
+        df = calculate_scores(df)
+
+    return normalize_schema(df)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m history_store',
+        description='점수 계산된 데이터를 연도/반기별 Parquet 저장소로 관리합니다.'
+    )
+    parser.add_argument('--root', default=DEFAULT_HISTORY_ROOT, help=f'저장소 폴더 (기본: {DEFAULT_HISTORY_ROOT})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='점수 계산된 엑셀(대시보드 데이터)을 반기별로 저장')
+    import_parser.add_argument('input', help='점수 계산된 xlsx (예: data/latest_data.xlsx)')
+    commands.add_parser('list', help='저장된 반기 목록')
+
+    args = parser.parse_args(argv)
+    store = HistoryStore(args.root)
+
+    if args.command == 'import':
+        try:
+            df = prepare_for_store(read_excel_cached(args.input))
+            written = store.write(df)
+        except KeyError as e:
+            print(f"❌ 저장 실패 ({args.input}): 점수 계산에 필요한 컬럼이 없습니다: {e}", file=sys.stderr)
+            return 1
+        except (OSError, ValueError) as e:
+            print(f"❌ 저장 실패 ({args.input}): {e}", file=sys.stderr)
+            return 1
+        print(f"✅ {len(df):,}행 → {args.root} ({', '.join(partition_label(p) for p in written)})")
+        return 0
+
+    partitions = store.partitions()
+    if not partitions:
+        print(f"⚠️ 저장된 반기가 없습니다: {args.root}")
+        return 1
+    for partition in partitions:
+        path = store.partition_path(partition)
+        print(f"   {partition_label(partition):<12}{os.path.getsize(path) / 1024:>10.1f} KB  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,47 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List
 
+# KPI 배점표 (점수 계산, 달성률, 등급, 개선 제안에서 공통 사용)
+# - rate: 원천 비율 컬럼 → '{name}_점수', '{name}_달성률' 컬럼 생성
+# - max: 배점 (달성률 = 점수 / 배점 × 100)
+# - scale: 비례 배점 (점수 = rate × scale), 등급제는 None
+# - grade_bins / grade_scores / grade_labels: 등급제 구간 하한과 구간별 점수/등급
+#   (결측은 최하 등급)
+# - fillna: 결측 비율 대체값 (None이면 결측 유지)
+KPI_SPECS = [
+    {'name': '안전점검', 'rate': '안전점검실점검율', 'max': 550, 'scale': 550, 'fillna': None},
+    {'name': '중점고객', 'rate': '중점고객안전점검율', 'max': 100, 'scale': 100, 'fillna': None},
+    {
+        'name': '사용계약', 'rate': '사용계약율', 'max': 50, 'scale': None, 'fillna': None,
+        'grade_bins': [0.70, 0.80, 0.90],
+        'grade_scores': [35, 40, 45, 50],
+        'grade_labels': ['D', 'C', 'B', 'A'],
+    },
+    {'name': '상담응대', 'rate': '상담응대율', 'max': 100, 'scale': 100, 'fillna': None},
+    {'name': '상담기여', 'rate': '상담기여도', 'max': 100, 'scale': 100, 'fillna': None},
+    {'name': '만족도', 'rate': '고객서비스만족도', 'max': 100, 'scale': 1, 'fillna': 0},
+]
+
+ADJUSTMENT_COLUMNS = ['민원대응적정성', '주의경고', '가점']
+
+TARGET_SCORE = 911
+
+CONTRACT_SPEC = next(spec for spec in KPI_SPECS if spec['name'] == '사용계약')
+
+# 점수 컬럼 저장 형식 (계산은 float64, 저장은 float32 → 메모리 절반)
+SCORE_DTYPE = np.float32
+SCORE_COLUMNS = (
+    [f"{spec['name']}_점수" for spec in KPI_SPECS] + ['총점', '목표대비'] +
+    [f"{spec['name']}_달성률" for spec in KPI_SPECS]
+)
+
+
+def _grade_index(rates: np.ndarray, bins: List[float]) -> np.ndarray:
+    """등급 구간 번호 (0 = 최하 등급, 결측 포함)"""
+    index = np.searchsorted(np.asarray(bins), rates, side='right')
+    return np.where(np.isnan(rates), 0, index)
+
+
 def calculate_scores(df: pd.DataFrame) -> pd.DataFrame:
     """
     누적 비율 기반 점수 계산
@@ -14,74 +55,69 @@ def calculate_scores(df: pd.DataFrame) -> pd.DataFrame:
     - B등급 (80~90% 미만): 45점
     - C등급 (70~80% 미만): 40점
     - D등급 (70% 미만): 35점
+
+    KPI_SPECS 배점표를 (행 × KPI) 행렬 한 번의 연산으로 계산
+    (목표 달성 판정은 float64 총점 기준, 점수 컬럼은 SCORE_DTYPE로 저장)
     """
     result_df = df.copy()
     
-    # 1. 안전점검실점검율 (550점)
-    result_df['안전점검_점수'] = (result_df['안전점검실점검율'] * 550).round(2)
-    
-    # 2. 중점고객안전점검율 (100점)
-    result_df['중점고객_점수'] = (result_df['중점고객안전점검율'] * 100).round(2)
-    
-    # 3. 사용계약율 (등급제, 50점) - 수정됨
-    def calculate_contract_score(rate):
-        """
-        수정된 사용계약 등급제:
-        - A등급 (90% 이상): 50점
-        - B등급 (80~90% 미만): 45점
-        - C등급 (70~80% 미만): 40점
-        - D등급 (70% 미만): 35점
-        """
-        if pd.isna(rate):
-            return 35
-        if rate >= 0.90:      # 90% 이상
-            return 50  # A등급
-        elif rate >= 0.80:    # 80% 이상 ~ 90% 미만
-            return 45  # B등급
-        elif rate >= 0.70:    # 70% 이상 ~ 80% 미만
-            return 40  # C등급
-        else:                 # 70% 미만
-            return 35  # D등급
-    
-    result_df['사용계약_점수'] = result_df['사용계약율'].apply(calculate_contract_score)
-    
-    # 4. 상담응대율 (100점)
-    result_df['상담응대_점수'] = (result_df['상담응대율'] * 100).round(2)
-    
-    # 5. 상담기여도 (100점)
-    result_df['상담기여_점수'] = (result_df['상담기여도'] * 100).round(2)
-    
-    # 6. 고객서비스만족도 (100점)
-    result_df['만족도_점수'] = result_df['고객서비스만족도'].fillna(0).round(2)
-    
-    # 총점 계산
-    result_df['총점'] = (
-        result_df['안전점검_점수'] +
-        result_df['중점고객_점수'] +
-        result_df['사용계약_점수'] +
-        result_df['상담응대_점수'] +
-        result_df['상담기여_점수'] +
-        result_df['만족도_점수'] +
-        result_df['민원대응적정성'] +
-        result_df['주의경고'] +
-        result_df['가점']
-    ).round(2)
+    # 원천 비율 행렬 (행 × KPI)
+    rates = np.column_stack([
+        result_df[spec['rate']].to_numpy(dtype=np.float64) for spec in KPI_SPECS
+    ])
+    
+    fill_values = np.array([np.nan if spec['fillna'] is None else spec['fillna'] for spec in KPI_SPECS])
+    rates = np.where(np.isnan(rates) & ~np.isnan(fill_values), fill_values, rates)
+    
+    # 비례 배점
+    scales = np.array([np.nan if spec['scale'] is None else spec['scale'] for spec in KPI_SPECS])
+    scores = np.round(rates * scales, 2)
+    
+    new_columns = {}
+    for j, spec in enumerate(KPI_SPECS):
+        if spec['scale'] is None:
+            # 등급제 배점
+            grade = _grade_index(rates[:, j], spec['grade_bins'])
+            grade_scores = np.asarray(spec['grade_scores'])[grade]
+            scores[:, j] = grade_scores
+            new_columns[f"{spec['name']}_점수"] = grade_scores
+        else:
+            new_columns[f"{spec['name']}_점수"] = scores[:, j]
+    
+    # 총점 = KPI 점수 + 감점/가점
+    total = scores[:, 0].copy()
+    for j in range(1, len(KPI_SPECS)):
+        total += scores[:, j]
+    for col in ADJUSTMENT_COLUMNS:
+        total += result_df[col].to_numpy(dtype=np.float64)
+    total = np.round(total, 2)
+    
+    new_columns['총점'] = total
     
     # 목표 달성 여부 (911점)
-    result_df['목표달성여부'] = result_df['총점'] >= 911
-    result_df['목표대비'] = (result_df['총점'] - 911).round(2)
+    new_columns['목표달성여부'] = total >= TARGET_SCORE
+    new_columns['목표대비'] = np.round(total - TARGET_SCORE, 2)
     
     # 각 지표의 달성률 (백분율)
-    result_df['안전점검_달성률'] = (result_df['안전점검_점수'] / 550 * 100).round(1)
-    result_df['중점고객_달성률'] = (result_df['중점고객_점수'] / 100 * 100).round(1)
-    result_df['사용계약_달성률'] = (result_df['사용계약_점수'] / 50 * 100).round(1)
-    result_df['상담응대_달성률'] = (result_df['상담응대_점수'] / 100 * 100).round(1)
-    result_df['상담기여_달성률'] = (result_df['상담기여_점수'] / 100 * 100).round(1)
-    result_df['만족도_달성률'] = (result_df['만족도_점수'] / 100 * 100).round(1)
+    max_scores = np.array([spec['max'] for spec in KPI_SPECS])
+    achievement = np.round(scores / max_scores * 100, 1)
+    for j, spec in enumerate(KPI_SPECS):
+        new_columns[f"{spec['name']}_달성률"] = achievement[:, j]
+    
+    for col, values in new_columns.items():
+        result_df[col] = values.astype(SCORE_DTYPE) if col in SCORE_COLUMNS else values
     
     return result_df
 
 
+def compact_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """점수 컬럼(SCORE_COLUMNS 중 있는 것)을 SCORE_DTYPE로 변환"""
+    for col in SCORE_COLUMNS:
+        if col in df.columns and df[col].dtype != SCORE_DTYPE:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(SCORE_DTYPE)
+    return df
+
+
 def get_final_period_score(df: pd.DataFrame) -> pd.DataFrame:
     """
     반기별 최종 점수 추출
@@ -89,41 +125,42 @@ def get_final_period_score(df: pd.DataFrame) -> pd.DataFrame:
     상반기: 6월 점수 = 1~6월 누적 최종
     하반기: 12월 점수 = 7~12월 누적 최종
     
-    현재까지 데이터만 있으면 현재까지의 최종
+    현재까지 데이터만 있으면 현재까지의 최종 (연도별로 따로 추출)
     """
-    # 반기별 마지막 월 데이터만 추출
-    final_scores = df.loc[df.groupby(['센터명', '반기'])['평가월'].idxmax()]
+    # 연도-반기별 마지막 월 데이터만 추출
+    final_scores = df.loc[df.groupby(['센터명', '연도', '반기'], observed=True)['평가월'].idxmax()]
     
     result = final_scores[[
-        '센터명', '반기', '평가월', '월', '총점', 
+        '센터명', '연도', '반기', '평가월', '월', '총점', 
         '목표달성여부', '목표대비',
         '안전점검_점수', '중점고객_점수', '사용계약_점수',
         '상담응대_점수', '상담기여_점수', '만족도_점수'
     ]].copy()
     
-    result = result.sort_values(['반기', '총점'], ascending=[True, False])
+    result = result.sort_values(['연도', '반기', '총점'], ascending=[True, True, False])
     
     return result
 
 
 def calculate_annual_evaluation(df: pd.DataFrame) -> pd.DataFrame:
     """
-    연간 평가 (상반기 + 하반기 평균)
+    연간 평가 (상반기 + 하반기 평균, 센터-연도별 1행)
     
     재계약 기준: (상반기 최종 + 하반기 최종) / 2 >= 911
     """
     final_scores = get_final_period_score(df)
     
-    # 반기별 피벗
+    # 반기별 피벗 (범주형 키는 문자열로 → 관측되지 않은 반기 컬럼이 생기지 않도록)
+    final_scores = final_scores.astype({'센터명': str, '반기': str})
     pivot = final_scores.pivot(
-        index='센터명', 
+        index=['센터명', '연도'], 
         columns='반기', 
         values='총점'
     ).reset_index()
     
-    # 연간 평균 계산
+    # 연간 평균 계산 (하반기가 아직 없는 연도는 상반기 점수)
     if '상반기' in pivot.columns and '하반기' in pivot.columns:
-        pivot['연간평균'] = ((pivot['상반기'] + pivot['하반기']) / 2).round(2)
+        pivot['연간평균'] = pivot[['상반기', '하반기']].mean(axis=1).round(2)
         pivot['상반기'] = pivot['상반기'].round(2)
         pivot['하반기'] = pivot['하반기'].round(2)
     elif '상반기' in pivot.columns:
@@ -140,8 +177,8 @@ def calculate_annual_evaluation(df: pd.DataFrame) -> pd.DataFrame:
     pivot['재계약가능'] = pivot['연간평균'] >= 911
     pivot['목표대비'] = (pivot['연간평균'] - 911).round(2)
     
-    # 정렬
-    pivot = pivot.sort_values('연간평균', ascending=False)
+    # 정렬 (최근 연도 먼저)
+    pivot = pivot.sort_values(['연도', '연간평균'], ascending=[False, False])
     
     return pivot
 
@@ -151,7 +188,7 @@ def get_summary_stats(df: pd.DataFrame) -> Dict:
     전체 통계 요약 (최신 월 기준)
     """
     # 각 센터의 최신 월 데이터만
-    latest_data = df.loc[df.groupby('센터명')['평가월'].idxmax()]
+    latest_data = df.loc[df.groupby('센터명', observed=True)['평가월'].idxmax()]
     
     return {
         'total_centers': latest_data['센터명'].nunique(),
@@ -181,9 +218,12 @@ def predict_period_achievement(df: pd.DataFrame, target: float = 911) -> Dict:
         if len(center_data) == 0:
             continue
         
-        # 현재 반기
+        # 현재 반기 (같은 연도)
+        current_year = center_data['연도'].iloc[-1]
         current_period = center_data['반기'].iloc[-1]
-        period_data = center_data[center_data['반기'] == current_period]
+        period_data = center_data[
+            (center_data['연도'] == current_year) & (center_data['반기'] == current_period)
+        ]
         
         # 현재까지 최신 점수
         current_score = period_data['총점'].iloc[-1]
@@ -223,6 +263,59 @@ def predict_period_achievement(df: pd.DataFrame, target: float = 911) -> Dict:
     return predictions
 
 
+def calculate_predicted_scores(df: pd.DataFrame, current_month: int) -> pd.DataFrame:
+    """
+    반기 최종(6개월차) 점수 일괄 예측 (벡터 연산)
+
+    - 누적형 지표 (안전점검, 중점고객): 진행률 기반 예측 (배점 상한)
+    - 사용계약: 현재 점수 × 1.1 (배점 상한)
+    - 비누적형 지표 (상담응대, 상담기여, 만족도): 현재 점수 유지
+    - 예측 총점은 1000점 상한
+
+    current_month는 반기 내 진행 월 (1~6), 6 이상이면 현재 점수가 최종 점수
+    반환값은 df와 같은 인덱스의 예측 컬럼 DataFrame
+    """
+    def score(col: str) -> np.ndarray:
+        # 컬럼이 없으면 0점 처리
+        if col in df.columns:
+            return df[col].to_numpy(dtype=np.float64)
+        return np.zeros(len(df))
+
+    안전점검 = score('안전점검_점수')
+    중점고객 = score('중점고객_점수')
+    사용계약 = score('사용계약_점수')
+    상담응대 = score('상담응대_점수')
+    상담기여 = score('상담기여_점수')
+    만족도 = score('만족도_점수')
+    조정항목 = score('민원대응적정성') + score('주의경고') + score('가점')
+
+    if current_month >= 6:
+        예측총점 = df['총점'].to_numpy(dtype=np.float64)
+    else:
+        progress_rate = current_month / 6
+
+        안전점검 = np.minimum(안전점검 / progress_rate, 550)
+        중점고객 = np.minimum(중점고객 / progress_rate, 100)
+        사용계약 = np.minimum(사용계약 * 1.1, 50)
+
+        예측총점 = np.minimum(
+            안전점검 + 중점고객 + 사용계약 +
+            상담응대 + 상담기여 + 만족도 + 조정항목,
+            1000
+        )
+
+    return pd.DataFrame({
+        '예측총점': 예측총점,
+        '안전점검_예측': 안전점검,
+        '중점고객_예측': 중점고객,
+        '사용계약_예측': 사용계약,
+        '상담응대_예측': 상담응대,
+        '상담기여_예측': 상담기여,
+        '만족도_예측': 만족도,
+        '조정항목': 조정항목
+    }, index=df.index)
+
+
 def get_weak_kpis(row: pd.Series, threshold: float = 85.0) -> List[str]:
     """
     취약 지표 식별 (달성률 threshold% 미만)
@@ -230,12 +323,7 @@ def get_weak_kpis(row: pd.Series, threshold: float = 85.0) -> List[str]:
     weak_kpis = []
     
     kpi_dict = {
-        '안전점검실점검율': row.get('안전점검_달성률', 0),
-        '중점고객안전점검율': row.get('중점고객_달성률', 0),
-        '사용계약율': row.get('사용계약_달성률', 0),
-        '상담응대율': row.get('상담응대_달성률', 0),
-        '상담기여도': row.get('상담기여_달성률', 0),
-        '고객서비스만족도': row.get('만족도_달성률', 0)
+        spec['rate']: row.get(f"{spec['name']}_달성률", 0) for spec in KPI_SPECS
     }
     
     for kpi_name, achievement_rate in kpi_dict.items():
@@ -256,15 +344,18 @@ def get_contract_grade(rate: float) -> str:
     - D등급: 70% 미만
     """
     if pd.isna(rate):
-        return 'D'
-    if rate >= 0.90:
-        return 'A'
-    elif rate >= 0.80:
-        return 'B'
-    elif rate >= 0.70:
-        return 'C'
-    else:
-        return 'D'
+        return CONTRACT_SPEC['grade_labels'][0]
+    
+    grade = _grade_index(np.array([rate], dtype=np.float64), CONTRACT_SPEC['grade_bins'])[0]
+    return CONTRACT_SPEC['grade_labels'][grade]
+
+
+def get_contract_grades(rates: pd.Series) -> pd.Series:
+    """
+    사용계약율 등급 일괄 계산 (get_contract_grade의 벡터 버전)
+    """
+    grade = _grade_index(rates.to_numpy(dtype=np.float64), CONTRACT_SPEC['grade_bins'])
+    return pd.Series(np.asarray(CONTRACT_SPEC['grade_labels'])[grade], index=rates.index)
 
 
 def add_contract_grades(df: pd.DataFrame) -> pd.DataFrame:
@@ -272,7 +363,7 @@ def add_contract_grades(df: pd.DataFrame) -> pd.DataFrame:
     사용계약 등급 컬럼 추가
     """
     df = df.copy()
-    df['사용계약등급'] = df['사용계약율'].apply(get_contract_grade)
+    df['사용계약등급'] = get_contract_grades(df['사용계약율'])
     return df
 
 
@@ -296,36 +387,12 @@ def get_improvement_suggestions(row: pd.Series, target: float = 911) -> Dict[str
     
     # 각 KPI별 개선 가능 점수 계산
     kpi_improvements = {
-        '안전점검': {
-            'current': row['안전점검_점수'],
-            'max': 550,
-            'potential': 550 - row['안전점검_점수']
-        },
-        '중점고객': {
-            'current': row['중점고객_점수'],
-            'max': 100,
-            'potential': 100 - row['중점고객_점수']
-        },
-        '사용계약': {
-            'current': row['사용계약_점수'],
-            'max': 50,
-            'potential': 50 - row['사용계약_점수']
-        },
-        '상담응대': {
-            'current': row['상담응대_점수'],
-            'max': 100,
-            'potential': 100 - row['상담응대_점수']
-        },
-        '상담기여': {
-            'current': row['상담기여_점수'],
-            'max': 100,
-            'potential': 100 - row['상담기여_점수']
-        },
-        '만족도': {
-            'current': row['만족도_점수'],
-            'max': 100,
-            'potential': 100 - row['만족도_점수']
+        spec['name']: {
+            'current': row[f"{spec['name']}_점수"],
+            'max': spec['max'],
+            'potential': spec['max'] - row[f"{spec['name']}_점수"]
         }
+        for spec in KPI_SPECS
     }
     
     # 개선 가능성 높은 순으로 정렬
@@ -369,13 +436,13 @@ def calculate_monthly_trends(df: pd.DataFrame) -> pd.DataFrame:
     df = df.sort_values(['센터명', '평가월'])
     
     # 센터별 전월 대비 증감
-    df['전월대비_총점'] = df.groupby('센터명')['총점'].diff()
-    df['전월대비_안전점검'] = df.groupby('센터명')['안전점검_점수'].diff()
-    df['전월대비_중점고객'] = df.groupby('센터명')['중점고객_점수'].diff()
-    df['전월대비_사용계약'] = df.groupby('센터명')['사용계약_점수'].diff()
-    df['전월대비_상담응대'] = df.groupby('센터명')['상담응대_점수'].diff()
-    df['전월대비_상담기여'] = df.groupby('센터명')['상담기여_점수'].diff()
-    df['전월대비_만족도'] = df.groupby('센터명')['만족도_점수'].diff()
+    df['전월대비_총점'] = df.groupby('센터명', observed=True)['총점'].diff()
+    df['전월대비_안전점검'] = df.groupby('센터명', observed=True)['안전점검_점수'].diff()
+    df['전월대비_중점고객'] = df.groupby('센터명', observed=True)['중점고객_점수'].diff()
+    df['전월대비_사용계약'] = df.groupby('센터명', observed=True)['사용계약_점수'].diff()
+    df['전월대비_상담응대'] = df.groupby('센터명', observed=True)['상담응대_점수'].diff()
+    df['전월대비_상담기여'] = df.groupby('센터명', observed=True)['상담기여_점수'].diff()
+    df['전월대비_만족도'] = df.groupby('센터명', observed=True)['만족도_점수'].diff()
     
     # 추세 방향
     df['추세'] = df['전월대비_총점'].apply(
@@ -388,32 +455,48 @@ def calculate_monthly_trends(df: pd.DataFrame) -> pd.DataFrame:
 def get_ranking_changes(df: pd.DataFrame) -> pd.DataFrame:
     """
     월별 순위 변동 추적
+    
+    총점이 없는(NaN) 센터는 순위를 매기지 않음 (순위/전월순위/순위변동: Int64 <NA>)
     """
     df = df.copy()
     df = df.sort_values(['평가월', '총점'], ascending=[True, False])
     
     # 월별 순위 계산
-    df['순위'] = df.groupby('평가월')['총점'].rank(ascending=False, method='min').astype(int)
+    df['순위'] = (
+        df.groupby('평가월')['총점']
+        .rank(ascending=False, method='min', na_option='keep')
+        .astype('Int64')
+    )
     
     # 전월 순위
     df = df.sort_values(['센터명', '평가월'])
-    df['전월순위'] = df.groupby('센터명')['순위'].shift(1)
+    df['전월순위'] = df.groupby('센터명', observed=True)['순위'].shift(1)
     
     # 순위 변동
     df['순위변동'] = df['전월순위'] - df['순위']
-    df['순위변동_표시'] = df['순위변동'].apply(
-        lambda x: f'↑{int(x)}' if x > 0 else (f'↓{int(abs(x))}' if x < 0 else '→') if pd.notna(x) else '-'
-    )
+    df['순위변동_표시'] = format_rank_changes(df['순위변동'])
     
     return df
 
 
+def format_rank_changes(changes: pd.Series) -> pd.Series:
+    """순위 변동 표시 (↑2 / ↓1 / → / 전월 또는 이번 달 순위 없음 '-')"""
+    changes = changes.astype('float64')
+    steps = changes.fillna(0).abs().astype(int).astype(str)
+    labels = np.select(
+        [changes > 0, changes < 0, changes == 0],
+        ['↑' + steps, '↓' + steps, '→'],
+        default='-'
+    )
+    return pd.Series(labels, index=changes.index)
+
+
 def export_summary_report(df: pd.DataFrame, filepath: str = None) -> pd.DataFrame:
     """
     요약 리포트 생성 (엑셀 내보내기용)
     """
     # 최신 월 데이터
-    latest = df.loc[df.groupby('센터명')['평가월'].idxmax()].copy()
+    latest = df.loc[df.groupby('센터명', observed=True)['평가월'].idxmax()].copy()
     
     report = latest[[
         '센터명', '평가월', '총점', '목표달성여부', '목표대비',
@@ -427,7 +510,7 @@ def export_summary_report(df: pd.DataFrame, filepath: str = None) -> pd.DataFram
     ]].copy()
     
     # 사용계약 등급 추가
-    report['사용계약등급'] = report['사용계약율'].apply(get_contract_grade) if '사용계약율' in report.columns else '-'
+    report['사용계약등급'] = get_contract_grades(report['사용계약율']) if '사용계약율' in report.columns else '-'
     
     # 순위
     report = report.sort_values('총점', ascending=False)
@@ -0,0 +1,291 @@
+"""
+월별 평가 파일 일괄 점수 계산 (Streamlit 없이 실행)
+
+load_cumulative_data → validate_cumulative_data → calculate_scores → 엑셀 저장
+
+사용 예:
+    python -m score_pipeline upload.xlsx -o data/latest_data.xlsx
+    python -m score_pipeline inbox/*.xlsx --output-dir scored/
+    python -m score_pipeline export.csv -o data/latest_data.xlsx
+
+    # 지역별 파일을 합쳐 한 번에 계산 (파일/시트별 병렬 읽기)
+    python -m score_pipeline regions/*.xlsx --merge -o data/latest_data.xlsx
+
+    # 이번 달 당월 실적만 기존 데이터에 추가 (전체 재계산 없음)
+    python -m score_pipeline 2026-07.xlsx --append-to data/latest_data.xlsx
+
+    # 연도/반기별 이력 저장소에 저장 / 현재 반기 파일에만 당월 실적 추가
+    python -m score_pipeline upload.xlsx -o data/latest_data.xlsx --history-dir data/history
+    python -m score_pipeline 2026-07.xlsx --append-to data/history
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from data_loader import (
+    load_cumulative_data, validate_cumulative_data, load_monthly_increment,
+    read_excel_cached, write_excel, LoadDiagnostics, SATISFACTION_MODES
+)
+from score_calculator import calculate_scores
+from history_store import HistoryStore, partition_label
+
+STAGES = ['load', 'append', 'validate', 'score', 'export', 'history']
+
+
+def print_diagnostics(diagnostics: LoadDiagnostics) -> None:
+    """data_loader 진행 메시지를 콘솔로 출력 (경고/오류는 stderr)"""
+    for message in diagnostics.messages:
+        stream = sys.stderr if message.level in ('warning', 'error') else sys.stdout
+        print(f"   {message.text}", file=stream)
+        if message.detail:
+            print(message.detail, file=stream)
+
+
+def export_scores(df: pd.DataFrame, output_path: str) -> None:
+    """점수 계산 결과를 엑셀로 저장 (대시보드 다운로드 파일과 같은 형식)"""
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    write_excel(df, output_path)
+
+
+def run_pipeline(input_path: Union[str, List[str]], output_path: str,
+                 diagnostics: Optional[LoadDiagnostics] = None,
+                 satisfaction_mode: str = 'mean',
+                 max_workers: Optional[int] = None,
+                 history_dir: Optional[str] = None) -> Dict:
+    """
+    파일 1개 처리 (경로 목록이면 병합 후 한 번에 계산)
+    history_dir을 지정하면 결과를 연도/반기별 이력 저장소에도 저장 (해당 반기 파일 교체)
+
+    반환값: {'input', 'output', 'ok', 'rows', 'timings', 'errors'}
+    timings는 단계별 소요 시간 (초), 진행 메시지는 diagnostics에 기록
+    """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+
+    result = {
+        'input': input_path if isinstance(input_path, str) else ', '.join(input_path),
+        'output': output_path,
+        'ok': False,
+        'rows': 0,
+        'timings': {},
+        'errors': [],
+    }
+    timings = result['timings']
+
+    start = time.perf_counter()
+    df = load_cumulative_data(input_path, diagnostics, satisfaction_mode, max_workers)
+    timings['load'] = time.perf_counter() - start
+
+    if df is None:
+        result['errors'].append("파일 로딩 실패")
+        return result
+
+    start = time.perf_counter()
+    is_valid, errors = validate_cumulative_data(df, diagnostics)
+    timings['validate'] = time.perf_counter() - start
+
+    if not is_valid:
+        result['errors'].extend(errors)
+        return result
+
+    start = time.perf_counter()
+    df_scored = calculate_scores(df)
+    timings['score'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    export_scores(df_scored, output_path)
+    timings['export'] = time.perf_counter() - start
+
+    if history_dir:
+        start = time.perf_counter()
+        written = HistoryStore(history_dir).write(df_scored)
+        timings['history'] = time.perf_counter() - start
+        diagnostics.info(f"🗂️ 이력 저장소 반영: {', '.join(partition_label(p) for p in written)}")
+
+    result['ok'] = True
+    result['rows'] = len(df_scored)
+    return result
+
+
+def run_append(history_path: str, input_paths: List[str], output_path: str,
+               diagnostics: Optional[LoadDiagnostics] = None,
+               satisfaction_mode: str = 'mean',
+               max_workers: Optional[int] = None) -> Dict:
+    """
+    기존 점수 데이터에 당월 실적 파일을 순서대로 추가
+
+    history_path가 이력 저장소 폴더이면 최근 반기 파일만 읽고,
+    추가 결과는 해당 반기 파일만 교체해서 저장 (output_path 무시)
+    반환값은 run_pipeline과 같은 형식
+    """
+    if diagnostics is None:
+        diagnostics = LoadDiagnostics()
+
+    result = {
+        'input': ', '.join(input_paths),
+        'output': output_path,
+        'ok': False,
+        'rows': 0,
+        'timings': {},
+        'errors': [],
+    }
+    timings = result['timings']
+
+    store = HistoryStore(history_path) if os.path.isdir(history_path) else None
+
+    start = time.perf_counter()
+    if store is not None:
+        history = store.read(store.latest(1))
+        if history is None:
+            result['errors'].append(f"이력 저장소에 데이터가 없습니다: {history_path}")
+            return result
+    else:
+        history = read_excel_cached(history_path)
+        history['평가월'] = pd.to_datetime(history['평가월'])
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for input_path in input_paths:
+        history = load_monthly_increment(input_path, history, diagnostics, satisfaction_mode, max_workers)
+        if history is None:
+            timings['append'] = time.perf_counter() - start
+            result['errors'].append(f"당월 실적 추가 실패: {input_path}")
+            return result
+    timings['append'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    is_valid, errors = validate_cumulative_data(history, diagnostics)
+    timings['validate'] = time.perf_counter() - start
+
+    if not is_valid:
+        result['errors'].extend(errors)
+        return result
+
+    if store is not None:
+        start = time.perf_counter()
+        written = store.write(history)
+        timings['history'] = time.perf_counter() - start
+        diagnostics.info(f"🗂️ 이력 저장소 반영: {', '.join(partition_label(p) for p in written)}")
+        result['output'] = history_path
+    else:
+        start = time.perf_counter()
+        export_scores(history, output_path)
+        timings['export'] = time.perf_counter() - start
+
+    result['ok'] = True
+    result['rows'] = len(history)
+    return result
+
+
+def _print_result(result: Dict) -> None:
+    if result['ok']:
+        print(f"   ✅ {result['rows']:,}행 → {result['output']} ({_format_timings(result['timings'])})")
+    else:
+        for error in result['errors']:
+            print(f"   {error}", file=sys.stderr)
+        print(f"   ❌ 처리 실패 ({_format_timings(result['timings'])})", file=sys.stderr)
+
+
+def _output_path_for(input_path: str, output: Optional[str], output_dir: Optional[str]) -> str:
+    if output:
+        return output
+
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    directory = output_dir if output_dir else os.path.dirname(input_path)
+    return os.path.join(directory, f"{stem}_scored.xlsx")
+
+
+def _format_timings(timings: Dict[str, float]) -> str:
+    return " | ".join(f"{stage} {timings[stage] * 1000:.0f}ms" for stage in STAGES if stage in timings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m score_pipeline',
+        description='월별 평가 파일을 점수 계산 후 엑셀로 저장합니다.'
+    )
+    parser.add_argument('inputs', nargs='+', help='입력 파일 (xlsx, csv, parquet, 여러 개 가능)')
+    parser.add_argument('-o', '--output', help='출력 파일 경로 (입력 파일이 1개일 때만)')
+    parser.add_argument('--output-dir', help='출력 폴더 (기본: 입력 파일과 같은 폴더, <이름>_scored.xlsx)')
+    parser.add_argument('--append-to', metavar='HISTORY',
+                        help='입력 파일(당월 실적)을 기존 점수 데이터에 순서대로 추가 (기본 출력: HISTORY 덮어쓰기, '
+                             '이력 저장소 폴더이면 현재 반기 파일만 교체)')
+    parser.add_argument('--history-dir', help='점수 계산 결과를 연도/반기별 이력 저장소에도 저장')
+    parser.add_argument('--satisfaction-mode', choices=list(SATISFACTION_MODES), default='mean',
+                        help='당월만족도 누적 평균 방식: ' + ', '.join(
+                            f"{mode}({desc})" for mode, desc in SATISFACTION_MODES.items()) + ' (기본: mean)')
+    parser.add_argument('--merge', action='store_true',
+                        help='입력 파일(지역별 파일 등)을 합쳐 한 번에 계산 (-o/--output 필요)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='여러 파일/시트 병렬 읽기 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='단계별 진행 메시지 숨김')
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.inputs) > 1 and not (args.append_to or args.merge):
+        parser.error("-o/--output은 입력 파일이 1개일 때만 사용할 수 있습니다. --output-dir을 사용하세요.")
+    if args.merge and (args.append_to or not args.output):
+        parser.error("--merge는 -o/--output과 함께 사용하고 --append-to와 함께 쓸 수 없습니다.")
+
+    results = []
+    if args.append_to:
+        output_path = args.output or args.append_to
+        print(f"📄 {args.append_to} ← {', '.join(args.inputs)}")
+
+        diagnostics = LoadDiagnostics()
+        try:
+            result = run_append(args.append_to, args.inputs, output_path, diagnostics,
+                                args.satisfaction_mode, args.workers)
+        except Exception as e:
+            result = {'input': ', '.join(args.inputs), 'output': output_path, 'ok': False,
+                      'rows': 0, 'timings': {}, 'errors': [str(e)]}
+
+        if not args.quiet:
+            print_diagnostics(diagnostics)
+        _print_result(result)
+        results.append(result)
+
+    if args.append_to:
+        jobs = []
+    elif args.merge:
+        jobs = [args.inputs]
+    else:
+        jobs = args.inputs
+
+    for input_path in jobs:
+        input_text = input_path if isinstance(input_path, str) else ', '.join(input_path)
+        output_path = _output_path_for(input_path, args.output, args.output_dir)
+        print(f"📄 {input_text}")
+
+        diagnostics = LoadDiagnostics()
+        try:
+            result = run_pipeline(input_path, output_path, diagnostics, args.satisfaction_mode,
+                                  args.workers, args.history_dir)
+        except Exception as e:
+            result = {'input': input_text, 'output': output_path, 'ok': False,
+                      'rows': 0, 'timings': {}, 'errors': [str(e)]}
+
+        if not args.quiet:
+            print_diagnostics(diagnostics)
+
+        _print_result(result)
+        results.append(result)
+
+    succeeded = [r for r in results if r['ok']]
+    print("=" * 60)
+    print(f"📊 완료: {len(succeeded)}/{len(results)}개 파일")
+    for stage in STAGES:
+        total = sum(r['timings'].get(stage, 0) for r in results)
+        print(f"   {stage:<9}{total * 1000:>10.0f}ms")
+
+    return 0 if len(succeeded) == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())